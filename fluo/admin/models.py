@@ -25,6 +25,7 @@ from functools import update_wrapper
 
 from django.contrib import admin
 from django.forms.widgets import SelectMultiple
+from django.utils.html import format_html
 from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 
@@ -70,6 +71,8 @@ for field in [
 
 class RelatedSearchMixin:
     related_search_fields = {}
+    related_search_backend = None
+    related_search_display = None
 
     def get_related_search_fields(self, request):
         """
@@ -138,7 +141,12 @@ class RelatedSearchMixin:
         search_fields = self.get_related_search_fields(request)[field_name]
         if not search_fields and model_admin is not None:
             search_fields = model_admin.get_search_fields(request)
-        return RelatedSearchJsonView.as_view(model_admin=model_admin, search_fields=search_fields)(
+        return RelatedSearchJsonView.as_view(
+            model_admin=model_admin,
+            search_fields=search_fields,
+            search_backend=getattr(model_admin, "related_search_backend", None),
+            display=getattr(model_admin, "related_search_display", None),
+        )(
             request,
             related_field.name,
         )
@@ -164,8 +172,32 @@ class OrderedModelAdmin(ModelAdmin):
 
 
 class TreeOrderedModelAdmin(OrderedModelAdmin):
+    @property
+    def has_tree_path(self):
+        return issubclass(self.model, models.PathTreeOrderedModel)
+
+    def get_ordering(self, request):
+        # the materialized path lists the whole tree depth first, siblings by ordering
+        if self.has_tree_path:
+            return ["path"]
+        return super().get_ordering(request)
+
+    def get_list_display(self, request):
+        list_display = super().get_list_display(request)
+        if self.has_tree_path and tuple(list_display) == ("__str__",):
+            list_display = ["tree_node"]
+        return list_display
+
     def get_queryset(self, request):
-        return super().get_queryset(request).filter(parent__isnull=True)
+        queryset = super().get_queryset(request)
+        if self.has_tree_path:
+            return queryset.order_by("path")
+        return queryset.filter(parent__isnull=True)
+
+    def tree_node(self, obj):
+        return format_html("{}{}", "\u2014 " * obj.depth, obj)
+
+    tree_node.short_description = _("node")
 
 
 class CategoryModelAdmin(OrderedModelAdmin):
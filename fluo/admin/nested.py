@@ -19,19 +19,27 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+from functools import update_wrapper
+
 from django import forms
 from django.conf import settings
 from django.contrib.admin import helpers
 from django.contrib.admin.options import InlineModelAdmin, ModelAdmin, reverse
-from django.contrib.admin.utils import unquote
+from django.contrib.admin.utils import quote, unquote
 from django.core.exceptions import FieldDoesNotExist, PermissionDenied
-from django.db import models, transaction
+from django.db import connections, models, router, transaction
+from django.db.models import signals
+from django.db.models.constants import LOOKUP_SEP
 from django.forms.formsets import all_valid
+from django.forms.models import _get_foreign_key
+from django.forms.utils import ErrorDict
 from django.http import Http404
-from django.templatetags.static import static
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.utils.decorators import method_decorator
 from django.utils.encoding import force_text
 from django.utils.html import escape
+from django.utils.http import urlencode
 from django.utils.translation import gettext as _
 from django.views.decorators.csrf import csrf_protect
 
@@ -46,8 +54,77 @@ __all__ = [
 csrf_protect_m = method_decorator(csrf_protect)
 
 
+media_cache = {}
+
+
+def get_class_media(obj, build):
+    """
+    Return the media returned by ``build()``, built once for the class of
+    ``obj`` and the DEBUG setting (which selects the minified files).
+    """
+    key = (type(obj), settings.DEBUG)
+    try:
+        return media_cache[key]
+    except KeyError:
+        media_cache[key] = build()
+        return media_cache[key]
+
+
+def get_request_cache(request, name):
+    """
+    Return the ``name`` dict stored on the request, used to build the nested
+    inlines (and their formset classes) once per request.
+    """
+    if not request:
+        return {}
+    try:
+        caches = request._fluo_nested
+    except AttributeError:
+        caches = request._fluo_nested = {}
+    return caches.setdefault(name, {})
+
+
+def get_instance_key(obj):
+    if obj is None:
+        return None
+    return obj.pk if obj.pk is not None else id(obj)
+
+
+def get_bound_formsets(formsets):
+    return [formset for formset in formsets if not getattr(formset, "is_lazy", False)]
+
+
+class LazyNestedFormSet:
+    """
+    Placeholder of the formset of a lazy nested inline, rendered as a link
+    which loads the formset from ``NestedModelAdmin.nested_inline_view``.
+    """
+
+    is_lazy = True
+
+    def __init__(self, inline, formset_class, instance, prefix, url):
+        self.opts = inline
+        self.formset_class = formset_class
+        self.instance = instance
+        self.prefix = prefix
+        self.url = url
+
+    @property
+    def media(self):
+        return self.opts.media + self.formset_class.form().media
+
+
 class InlineInstancesMixin:
     def get_inline_instances(self, request, obj=None):
+        cache = get_request_cache(request, "inline_instances")
+        key = (type(self), get_instance_key(obj))
+        try:
+            return cache[key]
+        except KeyError:
+            cache[key] = self._get_inline_instances(request, obj)
+            return cache[key]
+
+    def _get_inline_instances(self, request, obj=None):
         inline_instances = []
         for inline_class in self.inlines:
             inline = inline_class(self.model, self.admin_site)
@@ -66,26 +143,149 @@ class InlineInstancesMixin:
 
 
 class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
+    # save the inline formsets level by level with bulk queries, the objects
+    # of models with a custom save() or save signals are still saved one by
+    # one; opt-in, as the nested formsets then skip save_formset()
+    bulk_save_nested = False
+
     @property
     def media(self):
-        media = super().media
-        css = media._css
-        css["all"] = css.get("all", []).append("fluo/admin/css/forms-nested.css")
-        js = media._js + [
-            f"fluo/admin/js/inlines-nested{'' if settings.DEBUG else '.min'}.js",
-        ]
-        return forms.Media(css=css, js=js)
+        def build():
+            media = super(NestedModelAdmin, self).media
+            css = dict(media._css)
+            css["all"] = css.get("all", []) + ["fluo/admin/css/forms-nested.css"]
+            js = media._js + [
+                f"fluo/admin/js/inlines-nested{'' if settings.DEBUG else '.min'}.js",
+            ]
+            return forms.Media(css=css, js=js)
+
+        return get_class_media(self, build)
 
     def save_formset(self, request, form, formset, change):
         """
         Given an inline formset save it to the database.
         """
-        formset.save()
+        if self.bulk_save_nested:
+            formsets = [formset]
+            while formsets:
+                self.bulk_save_formsets(request, formsets)
+                formsets = [
+                    nested_formset
+                    for formset in formsets
+                    for form in self.get_saved_forms(formset)
+                    for nested_formset in get_bound_formsets(form.nested_formsets)
+                ]
+            return
+
+        if self.formset_is_untouched(formset):
+            formset.new_objects, formset.changed_objects, formset.deleted_objects = [], [], []
+        else:
+            formset.save()
 
-        for form in formset.forms:
-            if hasattr(form, "nested_formsets") and form not in formset.deleted_forms:
-                for nested_formset in form.nested_formsets:
-                    self.save_formset(request, form, nested_formset, change)
+        for form in self.get_saved_forms(formset):
+            for nested_formset in get_bound_formsets(form.nested_formsets):
+                self.save_formset(request, form, nested_formset, change)
+
+    def get_saved_forms(self, formset):
+        """
+        Return the forms of ``formset`` with nested formsets to save.
+        """
+        if self.formset_is_untouched(formset):
+            deleted_forms = set()
+        else:
+            deleted_forms = set(formset.deleted_forms)
+        return [form for form in formset.forms if hasattr(form, "nested_formsets") and form not in deleted_forms]
+
+    def can_bulk_save(self, model, using):
+        """
+        Return True if the objects of ``model`` can be saved without calling
+        their ``save()``: it isn't overridden and there are no receivers of
+        the ``pre_save``/``post_save`` signals.
+        """
+        return not (
+            model.save is not models.Model.save
+            or model._meta.parents
+            or signals.pre_save.has_listeners(model)
+            or signals.post_save.has_listeners(model)
+        )
+
+    def bulk_save_formsets(self, request, formsets):
+        """
+        Save the ``formsets`` of a nesting level with a DELETE, a bulk UPDATE
+        and a bulk INSERT for every model (a single save() for new objects
+        when the database doesn't return the primary keys of a bulk insert).
+        """
+        deleted, changed, created = {}, {}, {}
+        for formset in formsets:
+            if self.formset_is_untouched(formset):
+                formset.new_objects, formset.changed_objects, formset.deleted_objects = [], [], []
+        formsets = [formset for formset in formsets if not self.formset_is_untouched(formset)]
+        for formset in formsets:
+            formset.save(commit=False)
+            deleted.setdefault(formset.model, []).extend(formset.deleted_objects)
+            objs, names = changed.setdefault(formset.model, ([], set()))
+            for obj, changed_data in formset.changed_objects:
+                objs.append(obj)
+                names.update(changed_data)
+            created.setdefault(formset.model, []).extend(formset.new_objects)
+
+        for model, objs in deleted.items():
+            self.bulk_delete_objects(model, objs)
+        for model, (objs, names) in changed.items():
+            self.bulk_update_objects(model, objs, names)
+        for model, objs in created.items():
+            self.bulk_create_objects(model, objs)
+
+        for formset in formsets:
+            formset.save_m2m()
+
+    def bulk_delete_objects(self, model, objs):
+        if objs and model.delete is models.Model.delete:
+            model._base_manager.using(router.db_for_write(model)).filter(pk__in=[obj.pk for obj in objs]).delete()
+        else:
+            for obj in objs:
+                obj.delete()
+
+    def bulk_update_objects(self, model, objs, names):
+        """
+        Update the changed ``objs``, writing the fields in ``names`` and the
+        ones changed by ``pre_save()`` (``auto_now`` and the like).
+        """
+        using = router.db_for_write(model)
+        if not objs:
+            return
+        if not self.can_bulk_save(model, using):
+            for obj in objs:
+                obj.save()
+            return
+        fields = set()
+        for obj in objs:
+            for field in model._meta.local_concrete_fields:
+                if field.primary_key:
+                    continue
+                if field.name in names:
+                    fields.add(field.name)
+                # auto_now and the like
+                value = getattr(obj, field.attname)
+                if field.pre_save(obj, False) != value:
+                    fields.add(field.name)
+        if fields:
+            model._base_manager.using(using).bulk_update(objs, fields)
+
+    def bulk_create_objects(self, model, objs):
+        using = router.db_for_write(model)
+        if not objs:
+            return
+        features = connections[using].features
+        # can_return_ids_from_bulk_insert on Django 2.2
+        can_return_rows = getattr(
+            features, "can_return_rows_from_bulk_insert", getattr(features, "can_return_ids_from_bulk_insert", False)
+        )
+        if self.can_bulk_save(model, using) and can_return_rows:
+            model._base_manager.using(using).bulk_create(objs)
+        else:
+            for obj in objs:
+                obj.save()
 
     def save_related(self, request, form, formsets, change):
         """
@@ -99,46 +299,123 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
         for formset in formsets:
             self.save_formset(request, form, formset, change=change)
 
-    def add_nested_inline_formsets(self, request, inline, formset, depth=0):
+    def get_nested_inline_url(self, root, path, instance, prefix):
+        opts = self.model._meta
+        url = reverse(
+            "%s:%s_%s_nested_inline" % (self.admin_site.name, opts.app_label, opts.model_name),
+            args=[quote(root.pk), "-".join(str(index) for index in path), quote(instance.pk)],
+        )
+        return "%s?%s" % (url, urlencode({"prefix": prefix}))
+
+    def prefetch_nested_inline(self, request, inline, fk, instances):
+        """
+        Return the objects of ``inline`` related to the saved ``instances``,
+        fetched with a single query and grouped by the value of ``fk``.
+        """
+        keys = {getattr(instance, fk.remote_field.field_name) for instance in instances if instance.pk is not None}
+        rows = {}
+        if keys:
+            queryset = inline.get_queryset(request).filter(**{"%s__in" % fk.name: keys})
+            # the ordering of BaseModelFormSet.get_queryset()
+            if not queryset.ordered:
+                queryset = queryset.order_by(inline.model._meta.pk.name)
+            for row in queryset:
+                rows.setdefault(getattr(row, fk.attname), []).append(row)
+        return rows
+
+    def add_nested_inline_formsets(self, request, inline, formset, depth=0, path=None, root=None):
+        """
+        Add the formsets of the nested inlines to every form of ``formset``.
+
+        ``path`` is the position of ``inline`` in the inlines tree and ``root``
+        the object of the change view: with both, the nested inlines with
+        ``lazy = True`` of saved objects get a ``LazyNestedFormSet``, unless
+        their formset has been submitted.
+        """
+        if root is None:
+            root = formset.instance
+        self.add_nested_inline_formsets_level(request, inline, [formset], depth=depth, path=path, root=root)
+
+    def add_nested_inline_formsets_level(self, request, inline, formsets, depth, path, root):
+        """
+        Add the nested formsets to the forms of all the ``formsets`` of the
+        same level, with one query for each nested inline.
+        """
         if depth > 5:
             raise Exception("Maximum nesting depth reached (5)")
-        for form in formset.forms:
-            nested_formsets = []
-            for nested_inline in inline.get_inline_instances(request):
+        forms = [form for formset in formsets for form in formset.forms]
+        for form in forms:
+            form.nested_formsets = []
+        for index, nested_inline in enumerate(inline.get_inline_instances(request)):
+            nested_path = None if path is None else path + (index,)
+            queryset = nested_inline.get_queryset(request)
+            pending = []
+            for form in forms:
                 InlineFormSet = nested_inline.get_formset(request, form.instance)
                 prefix = "%s-%s" % (form.prefix, InlineFormSet.get_default_prefix())
+                submitted = request.method == "POST" and any(s.startswith(prefix) for s in request.POST.keys())
 
-                if request.method == "POST" and any(s.startswith(prefix) for s in request.POST.keys()):
+                if nested_inline.lazy and nested_path and not submitted and root.pk and form.instance.pk:
+                    url = self.get_nested_inline_url(root, nested_path, form.instance, prefix)
+                    form.nested_formsets.append(
+                        LazyNestedFormSet(nested_inline, InlineFormSet, form.instance, prefix, url),
+                    )
+                    continue
+                if submitted:
                     nested_formset = InlineFormSet(
                         request.POST,
                         request.FILES,
                         instance=form.instance,
                         prefix=prefix,
-                        queryset=nested_inline.get_queryset(request),
+                        queryset=queryset,
                     )
                 else:
                     nested_formset = InlineFormSet(
                         instance=form.instance,
                         prefix=prefix,
-                        queryset=nested_inline.get_queryset(request),
+                        queryset=queryset,
                     )
-                nested_formsets.append(nested_formset)
-                if nested_inline.inlines:
-                    self.add_nested_inline_formsets(request, nested_inline, nested_formset, depth=depth + 1)
-            form.nested_formsets = nested_formsets
-
-    def wrap_nested_inline_formsets(self, request, inline, formset):
-        media = None
+                form.nested_formsets.append(nested_formset)
+                pending.append(nested_formset)
+            if not pending:
+                continue
+
+            fk = pending[0].fk
+            rows = self.prefetch_nested_inline(request, nested_inline, fk, [nested.instance for nested in pending])
+            for nested_formset in pending:
+                if nested_formset.instance.pk is not None:
+                    objs = rows.get(getattr(nested_formset.instance, fk.remote_field.field_name), [])
+                    for obj in objs:
+                        fk.set_cached_value(obj, nested_formset.instance)
+                    # the queryset cache of BaseModelFormSet.get_queryset()
+                    nested_formset._queryset = objs
+            if nested_inline.inlines:
+                self.add_nested_inline_formsets_level(
+                    request,
+                    nested_inline,
+                    pending,
+                    depth=depth + 1,
+                    path=nested_path,
+                    root=root,
+                )
 
-        def get_media(extra_media):
-            if media:
-                return media + extra_media
-            else:
-                return extra_media
+    def wrap_nested_inline_formsets(self, request, inline, formset, media_formsets=None):
+        """
+        Wrap the nested formsets of the forms of ``formset`` in an
+        ``InlineAdminFormSet`` and return their media, merged once for every
+        nested inline class instead of once for every form.
+        """
+        nested = media_formsets is not None
+        if not nested:
+            media_formsets = {}
 
         for form in formset.forms:
             wrapped_nested_formsets = []
             for nested_inline, nested_formset in zip(inline.get_inline_instances(request), form.nested_formsets):
+                if getattr(nested_formset, "is_lazy", False):
+                    wrapped_nested_formsets.append(nested_formset)
+                    media_formsets.setdefault(type(nested_inline), nested_formset)
+                    continue
                 if form.instance.pk:
                     instance = form.instance
                 else:
@@ -155,46 +432,197 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
                     model_admin=self,
                 )
                 wrapped_nested_formsets.append(wrapped_nested_formset)
-                media = get_media(wrapped_nested_formset.media)
+                media_formsets.setdefault(type(nested_inline), wrapped_nested_formset)
                 if nested_inline.inlines:
-                    media = get_media(self.wrap_nested_inline_formsets(request, nested_inline, nested_formset))
+                    self.wrap_nested_inline_formsets(request, nested_inline, nested_formset, media_formsets)
             form.nested_formsets = wrapped_nested_formsets
+
+        if nested:
+            return None
+        media = None
+        for wrapped_nested_formset in media_formsets.values():
+            if media:
+                media = media + wrapped_nested_formset.media
+            else:
+                media = wrapped_nested_formset.media
         return media
 
+    def formset_is_untouched(self, formset):
+        """
+        Return True if the submitted ``formset`` has no new, changed or
+        deleted forms, so it can be neither cleaned nor saved. Memoized on
+        the formset.
+        """
+        try:
+            return formset._fluo_untouched
+        except AttributeError:
+            pass
+        formset._fluo_untouched = (
+            formset.is_bound
+            and formset.management_form.is_valid()
+            and not any(form.has_changed() for form in formset.forms)
+        )
+        return formset._fluo_untouched
+
+    def formset_has_data(self, formset):
+        """
+        Return True if a form of ``formset``, or of its nested formsets, has
+        data. Memoized on the formset.
+        """
+        try:
+            return formset._fluo_has_data
+        except AttributeError:
+            pass
+        # the forms of an untouched formset have their initial data only
+        untouched = self.formset_is_untouched(formset)
+        formset._fluo_has_data = False
+        for form in formset:
+            if not untouched and hasattr(form, "cleaned_data") and form.cleaned_data:
+                formset._fluo_has_data = True
+                break
+            elif hasattr(form, "nested_formsets"):
+                if self.formset_has_nested_data(get_bound_formsets(form.nested_formsets)):
+                    formset._fluo_has_data = True
+                    break
+        return formset._fluo_has_data
+
     def formset_has_nested_data(self, formsets):
-        for formset in formsets:
-            if not formset.is_bound:
-                pass
-            for form in formset:
-                if hasattr(form, "cleaned_data") and form.cleaned_data:
-                    return True
-                elif hasattr(form, "nested_formsets"):
-                    if self.formset_has_nested_data(form.nested_formsets):
-                        return True
+        return any(self.formset_has_data(formset) for formset in formsets)
+
+    def skip_forms_clean(self, formset):
+        """
+        Mark the forms of an untouched ``formset`` as valid without cleaning
+        them, with their initial values as ``cleaned_data`` (nothing for the
+        extra forms). The formset still checks the number of forms and runs
+        its ``clean()``.
+        """
+        for form in formset.forms:
+            if form._errors is None:
+                form._errors = ErrorDict()
+                form.cleaned_data = (
+                    {}
+                    if form.empty_permitted
+                    else {name: form.get_initial_for_field(field, name) for name, field in form.fields.items()}
+                )
 
     def all_valid_with_nesting(self, formsets):
-        "Recursively validate all nested formsets"
+        "Recursively validate all nested formsets, without cleaning the forms of the untouched ones"
+        for formset in formsets:
+            if self.formset_is_untouched(formset):
+                self.skip_forms_clean(formset)
         if not all_valid(formsets):
             return False
 
         for formset in formsets:
-            if not formset.is_bound:
-                pass
+            untouched = self.formset_is_untouched(formset)
             for form in formset:
                 if hasattr(form, "nested_formsets"):
-                    if not self.all_valid_with_nesting(form.nested_formsets):
+                    nested_formsets = get_bound_formsets(form.nested_formsets)
+                    if not self.all_valid_with_nesting(nested_formsets):
                         return False
 
+                    if untouched:
+                        # only the empty extra forms have no object
+                        has_parent = not form.instance._state.adding
+                    else:
+                        has_parent = hasattr(form, "cleaned_data") and form.cleaned_data
                     # TODO - find out why this breaks when extra = 1 and just adding new item with no sub items
-                    if (not hasattr(form, "cleaned_data") or not form.cleaned_data) and self.formset_has_nested_data(
-                        form.nested_formsets,
-                    ):
+                    if not has_parent and self.formset_has_nested_data(nested_formsets):
+                        form.full_clean()
                         form._errors["__all__"] = form.error_class(
                             ["Parent object must be created when creating nested inlines."],
                         )
                         return False
         return True
 
+    def get_urls(self):
+        from django.urls import path
+
+        def wrap(view):
+            def wrapper(*args, **kwargs):
+                return self.admin_site.admin_view(view)(*args, **kwargs)
+
+            return update_wrapper(wrapper, view)
+
+        info = self.model._meta.app_label, self.model._meta.model_name
+
+        return [
+            path(
+                "<path:object_id>/nested/<str:inline_path>/<str:parent_id>/",
+                wrap(self.nested_inline_view),
+                name="%s_%s_nested_inline" % info,
+            ),
+        ] + super().get_urls()
+
+    def nested_inline_view(self, request, object_id, inline_path, parent_id):
+        """
+        Render the formset of a lazy nested inline: ``inline_path`` is the
+        position of the inline in the inlines tree, ``parent_id`` the primary
+        key of the object it is nested in.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_change_permission(request, obj):
+            raise PermissionDenied
+        try:
+            indexes = tuple(int(index) for index in inline_path.split("-"))
+            inlines = [self.get_inline_instances(request, obj)[indexes[0]]]
+            for index in indexes[1:]:
+                inlines.append(inlines[-1].get_inline_instances(request)[index])
+        except (ValueError, IndexError):
+            raise Http404
+        if len(inlines) < 2:
+            raise Http404
+        *parents, inline = inlines
+        # the parent object must belong to obj
+        lookup = LOOKUP_SEP.join(
+            _get_foreign_key(parent.parent_model, parent.model, fk_name=parent.fk_name).name
+            for parent in reversed(parents)
+        )
+        queryset = parents[-1].get_queryset(request).filter(**{lookup: obj.pk})
+        instance = get_object_or_404(queryset, pk=unquote(parent_id))
+
+        FormSet = inline.get_formset(request, instance)
+        prefix = request.GET.get("prefix") or FormSet.get_default_prefix()
+        formset = FormSet(instance=instance, prefix=prefix, queryset=inline.get_queryset(request))
+        if inline.inlines:
+            self.add_nested_inline_formsets(request, inline, formset, depth=len(parents), path=indexes, root=obj)
+            self.wrap_nested_inline_formsets(request, inline, formset)
+        inline_admin_formset = helpers.InlineAdminFormSet(
+            inline,
+            formset,
+            list(inline.get_fieldsets(request, instance)),
+            dict(inline.get_prepopulated_fields(request, instance)),
+            list(inline.get_readonly_fields(request, instance)),
+            model_admin=self,
+        )
+        # the formset it is nested in gives the same css classes as when it
+        # is rendered with its parent; only its prefix is used, so its rows
+        # are not loaded
+        parent = parents[-1]
+        fk = _get_foreign_key(parent.parent_model, parent.model, fk_name=parent.fk_name)
+        parent_instance = parent.parent_model(pk=getattr(instance, fk.attname))
+        ParentFormSet = parent.get_formset(request, parent_instance)
+        parent_formset = ParentFormSet(
+            instance=parent_instance,
+            prefix=request.GET.get("prev_prefix") or ParentFormSet.get_default_prefix(),
+            queryset=parent.get_queryset(request).none(),
+        )
+        recursive_formset = helpers.InlineAdminFormSet(
+            parent,
+            parent_formset,
+            list(parent.get_fieldsets(request, parent_instance)),
+            model_admin=self,
+        )
+        context = {
+            "inline_admin_formset": inline_admin_formset,
+            "recursive_formset": recursive_formset,
+            "prev_prefix": request.GET.get("prev_prefix", ""),
+            "loopCounter": request.GET.get("loop_counter", ""),
+        }
+        return TemplateResponse(request, inline.template, context)
+
     @csrf_protect_m
     @transaction.atomic
     def add_view(self, request, form_url="", extra_context=None):
@@ -344,7 +772,7 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
                 form_validated = False
                 new_object = obj
             prefixes = {}
-            for FormSet, inline in self.get_formsets_with_inlines(request, new_object):
+            for index, (FormSet, inline) in enumerate(self.get_formsets_with_inlines(request, new_object)):
                 prefix = FormSet.get_default_prefix()
                 prefixes[prefix] = prefixes.get(prefix, 0) + 1
                 if prefixes[prefix] != 1 or not prefix:
@@ -358,7 +786,7 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
                 )
                 formsets.append(formset)
                 if hasattr(inline, "inlines") and inline.inlines:
-                    self.add_nested_inline_formsets(request, inline, formset)
+                    self.add_nested_inline_formsets(request, inline, formset, path=(index,))
 
             if self.all_valid_with_nesting(formsets) and form_validated:
                 self.save_model(request, new_object, form, True)
@@ -370,7 +798,7 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
         else:
             form = ModelForm(instance=obj)
             prefixes = {}
-            for FormSet, inline in self.get_formsets_with_inlines(request, obj):
+            for index, (FormSet, inline) in enumerate(self.get_formsets_with_inlines(request, obj)):
                 prefix = FormSet.get_default_prefix()
                 prefixes[prefix] = prefixes.get(prefix, 0) + 1
                 if prefixes[prefix] != 1 or not prefix:
@@ -378,7 +806,7 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
                 formset = FormSet(instance=obj, prefix=prefix, queryset=inline.get_queryset(request))
                 formsets.append(formset)
                 if hasattr(inline, "inlines") and inline.inlines:
-                    self.add_nested_inline_formsets(request, inline, formset)
+                    self.add_nested_inline_formsets(request, inline, formset, path=(index,))
 
         adminForm = helpers.AdminForm(
             form,
@@ -428,15 +856,62 @@ class NestedModelAdmin(InlineInstancesMixin, ModelAdmin):
 class NestedInline(InlineInstancesMixin, InlineModelAdmin):
     inlines = []
     new_objects = []
+    # load the formsets of saved objects only when they are expanded
+    lazy = False
 
     @property
     def media(self):
-        extra = "" if settings.DEBUG else ".min"
-        media = super().media
-        js = media._js + [
-            f"fluo/admin/js/inlines-nested{'' if settings.DEBUG else '.min'}.js",
-        ]
-        return forms.Media(js=js)
+        def build():
+            media = super(NestedInline, self).media
+            js = media._js + [
+                f"fluo/admin/js/inlines-nested{'' if settings.DEBUG else '.min'}.js",
+            ]
+            return forms.Media(css=media._css, js=js)
+
+        return get_class_media(self, build)
+
+    # the hooks which may depend on the object, see get_formset_cache_key()
+    formset_object_hooks = [
+        "get_extra",
+        "get_min_num",
+        "get_max_num",
+        "get_fieldsets",
+        "get_readonly_fields",
+        "get_exclude",
+    ]
+
+    def get_formset_cache_key(self, request, obj=None):
+        """
+        Return the key of the formset class in the request cache, or None to
+        build a new class. By default the class depends on ``obj`` only through
+        the permissions and whether it is saved, and nothing is cached when the
+        inline overrides one of ``formset_object_hooks``: override if the
+        formset depends on something else, or to cache it anyway.
+        """
+        if any(getattr(type(self), name) is not getattr(NestedInline, name) for name in self.formset_object_hooks):
+            return None
+        return (
+            type(self),
+            obj is not None and obj.pk is not None,
+            self.has_add_permission(request, obj),
+            self.has_change_permission(request, obj),
+            self.has_delete_permission(request, obj),
+        )
+
+    def get_formset(self, request, obj=None, **kwargs):
+        key = self.get_formset_cache_key(request, obj) if request else None
+        if key is None:
+            return super().get_formset(request, obj, **kwargs)
+        # get_fieldsets() asks for the form of a formset with fields=None
+        key += tuple(sorted(kwargs.items()))
+        cache = get_request_cache(request, "formsets")
+        try:
+            return cache[key]
+        except TypeError:
+            return super().get_formset(request, obj, **kwargs)
+        except KeyError:
+            cache[key] = super().get_formset(request, obj, **kwargs)
+            return cache[key]
 
     def get_formsets_with_inlines(self, request, obj=None):
         for inline in self.get_inline_instances(request):
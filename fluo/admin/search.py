@@ -0,0 +1,294 @@
+# Copyright (C) 2007-2020, Raffaele Salmaso <raffaele@salmaso.org>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"search backends for the related search view"
+
+import operator
+import time
+from contextlib import contextmanager
+from functools import reduce
+
+from django.contrib.admin.utils import lookup_needs_distinct
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+__all__ = [
+    "SearchBackend",
+    "IContainsSearchBackend",
+    "TrigramSearchBackend",
+    "FullTextSearchBackend",
+    "FTS5SearchBackend",
+]
+
+
+class SearchBackend:
+    """
+    Filter (and rank) the queryset of the related search view.
+
+    ``time_budget`` is the maximum time, in milliseconds, the search query
+    can take: PostgreSQL, MySQL and SQLite abort it when it is exceeded.
+    """
+
+    time_budget = None
+
+    def __init__(self, time_budget=None):
+        if time_budget is not None:
+            self.time_budget = time_budget
+
+    def search(self, request, queryset, search_fields, search_term):
+        """
+        Return a tuple containing a queryset to implement the search
+        and a boolean indicating if the results may contain duplicates.
+        """
+        raise NotImplementedError("subclasses of SearchBackend must provide a search() method")
+
+    def can_narrow(self, search_fields):
+        """
+        Return True if the results of a term always include the results of
+        any longer term starting with it, so these can be searched among the
+        results of the shorter one.
+        """
+        return False
+
+    def get_field_names(self, search_fields):
+        return [str(search_field).lstrip("^=@") for search_field in search_fields]
+
+    def needs_distinct(self, queryset, lookups):
+        return any(lookup_needs_distinct(queryset.model._meta, lookup) for lookup in lookups)
+
+    @contextmanager
+    def budget(self, using):
+        connection = connections[using]
+        if not self.time_budget:
+            yield
+        elif connection.vendor == "postgresql":
+            with transaction.atomic(using=using):
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL statement_timeout = %s", [int(self.time_budget)])
+                yield
+        elif connection.vendor == "mysql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET SESSION max_execution_time = %s", [int(self.time_budget)])
+            try:
+                yield
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET SESSION max_execution_time = 0")
+        elif connection.vendor == "sqlite":
+            deadline = time.monotonic() + self.time_budget / 1000
+            connection.ensure_connection()
+            connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+            try:
+                yield
+            finally:
+                connection.connection.set_progress_handler(None, 0)
+        else:
+            yield
+
+
+class IContainsSearchBackend(SearchBackend):
+    """
+    The ``ModelAdmin.search_fields`` behaviour: every word must match at
+    least one field, with ``icontains`` (or ``istartswith``, ``iexact``,
+    ``search`` for fields starting with ``^``, ``=``, ``@``).
+    """
+
+    def can_narrow(self, search_fields):
+        # a longer word can stop matching iexact, or the full text search
+        return not any(str(search_field).startswith(("=", "@")) for search_field in search_fields)
+
+    def search(self, request, queryset, search_fields, search_term):
+        # Apply keyword searches.
+        def construct_search(field_name):
+            if field_name.startswith("^"):
+                return "%s__istartswith" % field_name[1:]
+            elif field_name.startswith("="):
+                return "%s__iexact" % field_name[1:]
+            elif field_name.startswith("@"):
+                return "%s__search" % field_name[1:]
+            # Use field_name if it includes a lookup.
+            opts = queryset.model._meta
+            lookup_fields = field_name.split(LOOKUP_SEP)
+            # Go through the fields, following all relations.
+            prev_field = None
+            for path_part in lookup_fields:
+                if path_part == "pk":
+                    path_part = opts.pk.name
+                try:
+                    field = opts.get_field(path_part)
+                except FieldDoesNotExist:
+                    # Use valid query lookups.
+                    if prev_field and prev_field.get_lookup(path_part):
+                        return field_name
+                else:
+                    prev_field = field
+                    if hasattr(field, "get_path_info"):
+                        # Update opts to follow the relation.
+                        opts = field.get_path_info()[-1].to_opts
+            # Otherwise, use the field with icontains.
+            return "%s__icontains" % field_name
+
+        use_distinct = False
+        if search_fields and search_term:
+            orm_lookups = [construct_search(str(search_field)) for search_field in search_fields]
+            for bit in search_term.split():
+                or_queries = [models.Q(**{orm_lookup: bit}) for orm_lookup in orm_lookups]
+                queryset = queryset.filter(reduce(operator.or_, or_queries))
+            use_distinct |= self.needs_distinct(queryset, orm_lookups)
+
+        return queryset, use_distinct
+
+
+class TrigramSearchBackend(SearchBackend):
+    """
+    PostgreSQL ``pg_trgm`` similarity search, ranked by the best matching
+    field. It needs the ``pg_trgm`` extension (``TrigramExtension``
+    migration operation) and a trigram index on the searched columns, see
+    ``get_index()``.
+    """
+
+    def search(self, request, queryset, search_fields, search_term):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        if not (search_fields and search_term):
+            return queryset, False
+        names = self.get_field_names(search_fields)
+        similarities = [TrigramSimilarity(name, search_term) for name in names]
+        rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        lookups = ["%s__trigram_similar" % name for name in names]
+        queryset = queryset.filter(reduce(operator.or_, [models.Q(**{lookup: search_term}) for lookup in lookups]))
+        queryset = queryset.annotate(search_rank=rank).order_by("-search_rank", "pk")
+        return queryset, self.needs_distinct(queryset, lookups)
+
+    @classmethod
+    def get_index(cls, fields, name):
+        from django.contrib.postgres.indexes import GinIndex
+
+        return GinIndex(fields=fields, name=name, opclasses=["gin_trgm_ops"] * len(fields))
+
+
+class FullTextSearchBackend(SearchBackend):
+    """
+    PostgreSQL full text search, ranked with ``ts_rank``. If
+    ``vector_field`` is given the (GIN indexed) ``SearchVectorField`` is
+    used instead of computing the vector of the search fields.
+    """
+
+    config = None
+    vector_field = None
+
+    def __init__(self, time_budget=None, config=None, vector_field=None):
+        super().__init__(time_budget=time_budget)
+        if config is not None:
+            self.config = config
+        if vector_field is not None:
+            self.vector_field = vector_field
+
+    def search(self, request, queryset, search_fields, search_term):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        if not (search_fields and search_term):
+            return queryset, False
+        names = self.get_field_names(search_fields)
+        if self.vector_field:
+            vector = models.F(self.vector_field)
+        else:
+            vector = SearchVector(*names, config=self.config)
+        query = SearchQuery(search_term, config=self.config)
+        queryset = queryset.annotate(search_vector=vector, search_rank=SearchRank(vector, query))
+        queryset = queryset.filter(search_vector=query).order_by("-search_rank", "pk")
+        return queryset, False if self.vector_field else self.needs_distinct(queryset, names)
+
+
+class FTS5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 search, ranked by bm25. The virtual table (by default
+    ``<db_table>_fts``) and the triggers which keep it in sync are created
+    by the statements returned by ``get_migration_sql()``.
+    """
+
+    table = None
+
+    def __init__(self, time_budget=None, table=None):
+        super().__init__(time_budget=time_budget)
+        if table is not None:
+            self.table = table
+
+    def get_table(self, model):
+        return self.table or "%s_fts" % model._meta.db_table
+
+    def can_narrow(self, search_fields):
+        return True
+
+    def get_match(self, search_term):
+        # every word is a quoted prefix query
+        return " ".join('"%s"*' % bit.replace('"', '""') for bit in search_term.split())
+
+    def search(self, request, queryset, search_fields, search_term):
+        if not search_term.split():
+            return queryset, False
+        model = queryset.model
+        table = connections[queryset.db].ops.quote_name(self.get_table(model))
+        column = "%s.%s" % (
+            connections[queryset.db].ops.quote_name(model._meta.db_table),
+            connections[queryset.db].ops.quote_name(model._meta.pk.column),
+        )
+        match = self.get_match(search_term)
+        queryset = queryset.filter(
+            pk__in=RawSQL("SELECT rowid FROM %s WHERE %s MATCH %%s" % (table, table), [match]),
+        ).annotate(
+            search_rank=RawSQL(
+                "SELECT rank FROM %s WHERE %s MATCH %%s AND rowid = %s" % (table, table, column), [match]
+            ),
+        )
+        return queryset.order_by("search_rank", "pk"), False
+
+    @classmethod
+    def get_migration_sql(cls, model, fields, table=None):
+        """
+        Return the ``(sql, reverse_sql)`` lists for a ``RunSQL`` operation
+        creating an external content FTS5 table on ``fields``.
+        """
+        db_table = model._meta.db_table
+        table = table or "%s_fts" % db_table
+        pk = model._meta.pk.column
+        columns = [model._meta.get_field(name).column for name in fields]
+        names = ", ".join(columns)
+        new = ", ".join("new.%s" % column for column in columns)
+        old = ", ".join("old.%s" % column for column in columns)
+        delete = "INSERT INTO %s(%s, rowid, %s) VALUES('delete', old.%s, %s);" % (table, table, names, pk, old)
+        insert = "INSERT INTO %s(rowid, %s) VALUES (new.%s, %s);" % (table, names, pk, new)
+        sql = [
+            "CREATE VIRTUAL TABLE %s USING fts5(%s, content='%s', content_rowid='%s')" % (table, names, db_table, pk),
+            "CREATE TRIGGER %s_ai AFTER INSERT ON %s BEGIN %s END" % (table, db_table, insert),
+            "CREATE TRIGGER %s_ad AFTER DELETE ON %s BEGIN %s END" % (table, db_table, delete),
+            "CREATE TRIGGER %s_au AFTER UPDATE ON %s BEGIN %s %s END" % (table, db_table, delete, insert),
+            "INSERT INTO %s(%s) VALUES('rebuild')" % (table, table),
+        ]
+        reverse_sql = [
+            "DROP TRIGGER %s_au" % table,
+            "DROP TRIGGER %s_ad" % table,
+            "DROP TRIGGER %s_ai" % table,
+            "DROP TABLE %s" % table,
+        ]
+        return sql, reverse_sql
@@ -1,77 +1,244 @@
-import operator
-from functools import reduce
+import datetime
+import hashlib
+import uuid
+from decimal import Decimal
 
-from django.contrib.admin.utils import lookup_needs_distinct
 from django.contrib.admin.views.autocomplete import AutocompleteJsonView
-from django.core.exceptions import FieldDoesNotExist
-from django.db import models
-from django.db.models.constants import LOOKUP_SEP
+from django.core import signing
+from django.core.cache import cache
+from django.db import OperationalError, models
 from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+from fluo.utils import json
+
+from .search import IContainsSearchBackend
+
+
+class CursorSerializer:
+    """
+    Serialize a list of values, keeping the type and the full precision of
+    the non JSON ones (``DjangoJSONEncoder`` truncates the datetimes to
+    milliseconds, which would skip or repeat rows at the page boundary).
+    """
+
+    types = [
+        ("datetime", datetime.datetime, datetime.datetime.isoformat, parse_datetime),
+        ("date", datetime.date, datetime.date.isoformat, parse_date),
+        ("time", datetime.time, datetime.time.isoformat, parse_time),
+        (
+            "timedelta",
+            datetime.timedelta,
+            lambda value: value // datetime.timedelta(microseconds=1),
+            lambda value: datetime.timedelta(microseconds=value),
+        ),
+        ("decimal", Decimal, str, Decimal),
+        ("uuid", uuid.UUID, str, uuid.UUID),
+    ]
+
+    def encode(self, value):
+        for name, type_, encode, decode in self.types:
+            if isinstance(value, type_):
+                return {name: encode(value)}
+        return value
+
+    def decode(self, value):
+        if isinstance(value, dict):
+            [(name, value)] = value.items()
+            for type_name, type_, encode, decode in self.types:
+                if type_name == name:
+                    return decode(value)
+            raise ValueError("Unknown cursor type %r." % name)
+        return value
+
+    def dumps(self, obj):
+        return json.dumps([self.encode(value) for value in obj], separators=(",", ":")).encode("latin-1")
+
+    def loads(self, data):
+        return [self.decode(value) for value in json.loads(data.decode("latin-1"))]
 
 
 class RelatedSearchJsonView(AutocompleteJsonView):
     search_fields = []
+    search_backend = None
+    # field names, or an expression, of the result text instead of str(obj)
+    display = None
+    # complete result sets up to cache_size rows are kept for cache_timeout
+    # seconds, to serve the next pages and to narrow longer terms
+    cache_timeout = 30
+    cache_size = 200
+    cursor_salt = "fluo.admin.views.RelatedSearchJsonView"
 
     def get_queryset(self):
         qs = self.model_admin.get_queryset(self.request)
         qs, search_use_distinct = self.get_search_results(self.request, qs, self.search_fields, self.term)
         if search_use_distinct:
             qs = qs.distinct()
+        candidates = self.get_cached_candidates()
+        if candidates is not None:
+            qs = qs.filter(pk__in=candidates)
+        self.ordering = self.get_keyset_ordering(qs)
+        if self.ordering is not None:
+            qs = qs.order_by(*self.ordering)
         return qs
 
+    def get_display(self):
+        if isinstance(self.display, str):
+            return [self.display]
+        return self.display
+
+    def get_projection(self, queryset):
+        """
+        Return the queryset of the dicts with the values needed by the
+        response, or the queryset itself if there is no ``display``.
+        """
+        display = self.get_display()
+        if display is None:
+            return queryset
+        names = ["pk"]
+        if self.ordering is not None:
+            names += [name.lstrip("-") for name in self.ordering if name.lstrip("-") not in names]
+        if isinstance(display, (list, tuple)):
+            names += [name for name in display if name not in names]
+        else:
+            queryset = queryset.annotate(related_search_text=display)
+            names.append("related_search_text")
+        return queryset.values(*names)
+
+    def get_value(self, obj, name):
+        if isinstance(obj, dict):
+            return obj[name]
+        return getattr(obj, name)
+
+    def serialize_result(self, obj):
+        if not isinstance(obj, dict):
+            return {"id": str(obj.pk), "text": str(obj)}
+        display = self.get_display()
+        if isinstance(display, (list, tuple)):
+            text = " ".join(str(obj[name]) for name in display if obj[name] not in (None, ""))
+        else:
+            text = str(obj["related_search_text"])
+        return {"id": str(obj["pk"]), "text": text}
+
+    def get_search_backend(self):
+        backend = self.search_backend
+        if backend is None:
+            return IContainsSearchBackend()
+        if isinstance(backend, type):
+            return backend()
+        return backend
+
     def get_search_results(self, request, queryset, search_fields, search_term):
         """
         Return a tuple containing a queryset to implement the search
         and a boolean indicating if the results may contain duplicates.
         """
-        # override ModelAdmin.get_search_results to use a custom search_fields
-
-        # Apply keyword searches.
-        def construct_search(field_name):
-            if field_name.startswith("^"):
-                return "%s__istartswith" % field_name[1:]
-            elif field_name.startswith("="):
-                return "%s__iexact" % field_name[1:]
-            elif field_name.startswith("@"):
-                return "%s__search" % field_name[1:]
-            # Use field_name if it includes a lookup.
-            opts = queryset.model._meta
-            lookup_fields = field_name.split(LOOKUP_SEP)
-            # Go through the fields, following all relations.
-            prev_field = None
-            for path_part in lookup_fields:
-                if path_part == "pk":
-                    path_part = opts.pk.name
-                try:
-                    field = opts.get_field(path_part)
-                except FieldDoesNotExist:
-                    # Use valid query lookups.
-                    if prev_field and prev_field.get_lookup(path_part):
-                        return field_name
-                else:
-                    prev_field = field
-                    if hasattr(field, "get_path_info"):
-                        # Update opts to follow the relation.
-                        opts = field.get_path_info()[-1].to_opts
-            # Otherwise, use the field with icontains.
-            return "%s__icontains" % field_name
-
-        use_distinct = False
-        if search_fields and search_term:
-            orm_lookups = [construct_search(str(search_field)) for search_field in search_fields]
-            for bit in search_term.split():
-                or_queries = [models.Q(**{orm_lookup: bit}) for orm_lookup in orm_lookups]
-                queryset = queryset.filter(reduce(operator.or_, or_queries))
-            use_distinct |= any(lookup_needs_distinct(queryset.model._meta, search_spec) for search_spec in orm_lookups)
-
-        return queryset, use_distinct
+        return self.backend.search(request, queryset, search_fields, search_term)
+
+    def normalize_term(self, term):
+        return " ".join(term.lower().split())
+
+    def get_cache_key(self, term):
+        return "fluo:related-search:%s:%s:%s:%s" % (
+            self.request.user.pk,
+            self.model_admin.model._meta.label_lower,
+            self.args[0] if self.args else "",
+            hashlib.md5(self.normalize_term(term).encode("utf-8")).hexdigest(),
+        )
+
+    def get_cached_candidates(self):
+        """
+        Return the cached results of the longest cached prefix of the term,
+        if the search backend allows to narrow them.
+        """
+        term = self.normalize_term(self.term)
+        if not self.cache_timeout or len(term) < 2 or not self.backend.can_narrow(self.search_fields):
+            return None
+        keys = {self.get_cache_key(term[:end]): end for end in range(1, len(term))}
+        cached = cache.get_many(list(keys))
+        if not cached:
+            return None
+        return cached[max(cached, key=keys.get)]
+
+    def get_keyset_ordering(self, queryset):
+        """
+        Return the ordering with the primary key as last tie breaker, or None
+        if the queryset ordering can't be used for keyset pagination.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pk = queryset.model._meta.pk
+        names = []
+        for name in ordering:
+            if not isinstance(name, str) or name == "?" or models.constants.LOOKUP_SEP in name:
+                return None
+            names.append(name.lstrip("-"))
+        if not {"pk", pk.name, pk.attname}.intersection(names):
+            ordering.append("pk")
+        return ordering
+
+    def get_cursor(self, obj):
+        values = [self.get_value(obj, name.lstrip("-")) for name in self.ordering]
+        values = [value.pk if isinstance(value, models.Model) else value for value in values]
+        if any(value is None for value in values):
+            return None
+        return signing.dumps(values, salt=self.cursor_salt, serializer=CursorSerializer)
+
+    def filter_cursor(self, queryset, cursor):
+        values = signing.loads(cursor, salt=self.cursor_salt, serializer=CursorSerializer)
+        if len(values) != len(self.ordering):
+            raise signing.BadSignature
+        q = models.Q()
+        for index, name in enumerate(self.ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition = models.Q(**{"%s__%s" % (name.lstrip("-"), lookup): values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                condition &= models.Q(**{previous.lstrip("-"): value})
+            q |= condition
+        return queryset.filter(q)
+
+    def get_page(self):
+        """
+        Return the objects of the requested page, and if there are more.
+
+        Pages are fetched with one row more than needed instead of counting,
+        after a keyset ``cursor`` if given, otherwise from the cached results
+        or with an offset. The results of the first page are cached when
+        they are no more than ``cache_size``.
+        """
+        limit = self.paginate_by
+        cursor = self.request.GET.get("cursor")
+        if cursor and self.ordering is not None:
+            try:
+                objs = list(self.filter_cursor(self.object_list, cursor)[: limit + 1])
+            except (signing.BadSignature, ValueError):
+                raise Http404("Invalid cursor.")
+            return objs[:limit], len(objs) > limit
+        try:
+            page = max(1, int(self.request.GET.get("page") or 1))
+        except ValueError:
+            page = 1
+        pks = None
+        if self.cache_timeout:
+            key = self.get_cache_key(self.term)
+            pks = cache.get(key)
+            if pks is None and page == 1:
+                pks = list(self.object_list.values_list("pk", flat=True)[: self.cache_size + 1])
+                if len(pks) <= self.cache_size:
+                    cache.set(key, pks, self.cache_timeout)
+        start, stop = (page - 1) * limit, page * limit + 1
+        if pks is None:
+            objs = list(self.object_list[start:stop])
+            return objs[:limit], len(objs) > limit
+        pks = pks[start:stop]
+        objs = {self.get_value(obj, "pk"): obj for obj in self.object_list.order_by().filter(pk__in=pks[:limit])}
+        return [objs[pk] for pk in pks[:limit] if pk in objs], len(pks) > limit
 
     def get(self, request, *args, **kwargs):
         """
         Return a JsonResponse with search results of the form:
         {
             results: [{id: "123" text: "foo"}],
-            pagination: {more: true}
+            pagination: {more: true, cursor: "..."}
         }
         """
         if not self.search_fields:
@@ -80,11 +247,25 @@ class RelatedSearchJsonView(AutocompleteJsonView):
             return JsonResponse({"error": "403 Forbidden"}, status=403)
 
         self.term = request.GET.get("term", "")
-        self.object_list = self.get_queryset()
-        context = self.get_context_data()
+        self.backend = self.get_search_backend()
+        self.object_list = self.get_projection(self.get_queryset())
+        try:
+            with self.backend.budget(self.object_list.db):
+                objs, more = self.get_page()
+                results = [self.serialize_result(obj) for obj in objs]
+        except OperationalError:
+            if not self.backend.time_budget:
+                raise
+            # the search took too long, give up
+            objs, results, more = [], [], False
+        pagination = {"more": more}
+        if more and self.ordering is not None:
+            cursor = self.get_cursor(objs[-1])
+            if cursor is not None:
+                pagination["cursor"] = cursor
         return JsonResponse(
             {
-                "results": [{"id": str(obj.pk), "text": str(obj)} for obj in context["object_list"]],
-                "pagination": {"more": context["page_obj"].has_next()},
+                "results": results,
+                "pagination": pagination,
             },
         )
@@ -23,11 +23,18 @@
 #   - CreationDateTimeField
 #   - ModificationDateTimeField
 
-from django.core import checks, validators
-from django.db import connection, models
-from django.db.models import lookups
+import datetime
+import operator
+from functools import lru_cache, reduce
+
+from django.core import checks, exceptions, validators
+from django.db import connection, connections, models
+from django.db.backends.ddl_references import Statement
+from django.db.models import ExpressionWrapper, lookups, signals
+from django.db.models.functions import Cast, Round
 from django.utils import timezone
 from django.utils.encoding import smart_text
+from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 from fluo import forms
@@ -45,6 +52,8 @@ __all__ = [
     "ModificationDateTimeField",
     "OrderField",
     "TimeDeltaField",
+    "NativeTimeDeltaField",
+    "copy_seconds_to_duration",
     "SlugField",
     "StringField",
     "EmailField",
@@ -53,6 +62,7 @@ __all__ = [
     "CIStringField",
     "CIEmailField",
     "CIURLField",
+    "CIIndex",
 ]
 
 
@@ -118,7 +128,7 @@ class TimeDeltaField(models.DecimalField):
 
     def formfield(self, **kwargs):
         defaults = {
-            "form_class": forms.TimeDeltaField,
+            "form_class": forms.NativeTimeDeltaField,
             "milliseconds": self.milliseconds,
         }
         defaults.update(kwargs)
@@ -127,13 +137,67 @@ class TimeDeltaField(models.DecimalField):
         return models.Field.formfield(self, **defaults)
 
 
+class NativeTimeDeltaField(models.DurationField):
+    """
+    A TimeDeltaField stored as a native interval (or a bigint of
+    microseconds where there is no interval type): values are
+    ``datetime.timedelta`` and ``Sum``/``Avg`` run in the database.
+    """
+
+    description = _("TimeDelta field")
+
+    def __init__(self, milliseconds=False, *args, **kwargs):
+        self.milliseconds = milliseconds
+        kwargs.setdefault("default", datetime.timedelta(0))
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.milliseconds:
+            kwargs["milliseconds"] = self.milliseconds
+        return name, path, args, kwargs
+
+    def formfield(self, **kwargs):
+        defaults = {
+            "form_class": forms.NativeTimeDeltaField,
+            "milliseconds": self.milliseconds,
+        }
+        defaults.update(kwargs)
+        # skip DurationField.formfield which forces forms.DurationField
+        return models.Field.formfield(self, **defaults)
+
+
+def copy_seconds_to_duration(queryset, source, target):
+    """
+    Copy the seconds of a TimeDeltaField (``source``) to a
+    NativeTimeDeltaField (``target``) with a single UPDATE, to be used in
+    a ``RunPython`` data migration.
+    """
+    connection = connections[queryset.db]
+    if connection.features.has_native_duration_field:
+        value = ExpressionWrapper(
+            models.F(source) * models.Value(datetime.timedelta(seconds=1)),
+            output_field=models.DurationField(),
+        )
+    else:
+        # Cast truncates, ie 1.000001 * 1000000 may give 1000000.9999 -> 1000000
+        value = Cast(Round(models.F(source) * models.Value(1000000)), models.BigIntegerField())
+    return queryset.update(**{target: value})
+
+
+@lru_cache(maxsize=None)
+def get_max_length_validator(max_length):
+    # validators are stateless, share one instance for each max_length
+    return validators.MaxLengthValidator(max_length)
+
+
 class StringField(models.Field):
     description = _("String")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if isinstance(self.max_length, int) and self.max_length > 0:
-            self.validators.append(validators.MaxLengthValidator(self.max_length))
+            self.validators.append(get_max_length_validator(self.max_length))
 
     def check(self, **kwargs):
         return [
@@ -153,14 +217,43 @@ class StringField(models.Field):
         return "CharField" if self.max_length else "TextField"
 
     def to_python(self, value):
-        if isinstance(value, str) or value is None:
+        if value is None or isinstance(value, str):
             return value
         return smart_text(value)
 
     def get_prep_value(self, value):
+        if type(value) is str:
+            return value
         value = super().get_prep_value(value)
         return self.to_python(value)
 
+    def clean_many(self, values, model_instance=None):
+        """
+        Clean a list of values, validating each distinct value only once.
+
+        Raises a ValidationError with the errors keyed by position.
+        """
+        cleaned, errors, seen = [], {}, {}
+        for index, value in enumerate(values):
+            try:
+                key = (type(value), value)
+                result = seen.get(key)
+            except TypeError:
+                key, result = None, None
+            if result is None:
+                try:
+                    result = (self.clean(value, model_instance), None)
+                except exceptions.ValidationError as e:
+                    result = (None, e)
+                if key is not None:
+                    seen[key] = result
+            cleaned.append(result[0])
+            if result[1] is not None:
+                errors[index] = result[1]
+        if errors:
+            raise exceptions.ValidationError(errors)
+        return cleaned
+
     def deconstruct(self):
         name, path, args, kwargs = super().deconstruct()
         kwargs["max_length"] = self.max_length
@@ -198,11 +291,19 @@ class URLField(StringField):
 
 
 class SlugField(StringField):
+    """
+    If ``populate_from`` is set, the slug is generated from that field when
+    the object is added or the source value changed since it was loaded.
+    Unique slugs get a ``-2``, ``-3``... suffix, looking up the existing
+    ones with a single ``LIKE 'slug%'`` query.
+    """
+
     default_validators = [validators.validate_slug]
     description = _("Slug")
 
-    def __init__(self, *args, db_index=True, allow_unicode=False, **kwargs):
+    def __init__(self, *args, db_index=True, allow_unicode=False, populate_from=None, **kwargs):
         self.allow_unicode = allow_unicode
+        self.populate_from = populate_from
         if self.allow_unicode:
             self.default_validators = [validators.validate_unicode_slug]
         super().__init__(*args, db_index=db_index, **kwargs)
@@ -215,8 +316,104 @@ class SlugField(StringField):
             del kwargs["db_index"]
         if self.allow_unicode is not False:
             kwargs["allow_unicode"] = self.allow_unicode
+        if self.populate_from is not None:
+            kwargs["populate_from"] = self.populate_from
         return name, path, args, kwargs
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        if self.populate_from is not None and not cls._meta.abstract:
+            signals.post_init.connect(self.remember_source, sender=cls)
+
+    def get_source_attname(self):
+        return "_%s_source" % self.attname
+
+    def remember_source(self, instance, **kwargs):
+        # a deferred source is not loaded just to remember it
+        if self.populate_from in instance.__dict__:
+            instance.__dict__[self.get_source_attname()] = instance.__dict__[self.populate_from]
+
+    def slugify(self, value):
+        slug = slugify(value, allow_unicode=self.allow_unicode)
+        return slug[: self.max_length] if self.max_length else slug
+
+    def is_stale(self, model_instance, value, base):
+        if not value:
+            return True
+        source = self.get_source_attname()
+        if source in model_instance.__dict__:
+            return model_instance.__dict__[source] != getattr(model_instance, self.populate_from)
+        # the loaded source is unknown: the slug is still valid if it is the
+        # base slug or a suffixed one
+        if value == base:
+            return False
+        prefix, sep, suffix = value.rpartition("-")
+        truncated = self.max_length and len(value) == self.max_length and base.startswith(prefix)
+        return not (sep and suffix.isdigit() and (prefix == base or truncated))
+
+    def get_lookup_prefix(self, base):
+        # make_unique() cuts a long base to make room for the "-N" suffix:
+        # look up the shortest prefix a suffix of up to 9 digits can leave
+        if self.max_length and len(base) > self.max_length - 10:
+            return base[: self.max_length - 10]
+        return base
+
+    def get_taken(self, model, bases, exclude=None, using=None):
+        queryset = model._default_manager.db_manager(using).all()
+        if exclude is not None:
+            queryset = queryset.exclude(pk=exclude)
+        lookup = "%s__startswith" % self.attname
+        taken = set()
+        bases = sorted({self.get_lookup_prefix(base) for base in bases})
+        for start in range(0, len(bases), 500):
+            stop = start + 500
+            q = reduce(operator.or_, [models.Q(**{lookup: base}) for base in bases[start:stop]])
+            taken.update(queryset.filter(q).values_list(self.attname, flat=True))
+        return taken
+
+    def make_unique(self, base, taken):
+        slug, index = base, 1
+        while slug in taken:
+            index += 1
+            suffix = "-%d" % index
+            slug = "%s%s" % (base[: self.max_length - len(suffix)] if self.max_length else base, suffix)
+        taken.add(slug)
+        return slug
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if self.populate_from is None:
+            return value
+        source = getattr(model_instance, self.populate_from)
+        base = self.slugify(source)
+        if add or self.is_stale(model_instance, value, base):
+            value = base
+            if self.unique:
+                taken = self.get_taken(
+                    model_instance.__class__,
+                    [base],
+                    exclude=model_instance.pk,
+                    using=model_instance._state.db,
+                )
+                value = self.make_unique(base, taken)
+            setattr(model_instance, self.attname, value)
+        model_instance.__dict__[self.get_source_attname()] = source
+        return value
+
+    def populate(self, objs, using=None):
+        """
+        Generate the slugs of many (unsaved) objects at once, ie before a
+        ``bulk_create``, with one lookup query per 500 distinct slugs.
+        """
+        objs = list(objs)
+        if not objs or self.populate_from is None:
+            return objs
+        bases = [self.slugify(getattr(obj, self.populate_from)) for obj in objs]
+        taken = self.get_taken(objs[0].__class__, bases, using=using) if self.unique else set()
+        for obj, base in zip(objs, bases):
+            setattr(obj, self.attname, self.make_unique(base, taken) if self.unique else base)
+        return objs
+
     def formfield(self, **kwargs):
         defaults = {"form_class": forms.SlugField, "allow_unicode": self.allow_unicode}
         defaults.update(kwargs)
@@ -257,24 +454,71 @@ class StatusField(StringField):
         )
 
 
-class CIStringField(CIText, StringField):  # noqa: F405
+class CIFieldMixin:
+    """
+    Case insensitive lookups that can use an index:
+
+    * on SQLite the column is declared ``COLLATE NOCASE``, so the ``LIKE``
+      used by the case insensitive lookups is index backed
+    * on PostgreSQL with ``citext`` columns, ``exact`` is a plain ``=``
+    * on MySQL the default collations are already case insensitive
+
+    Elsewhere use a ``CIIndex`` to index ``UPPER(column)``.
+    """
+
+    def db_type(self, connection):
+        db_type = super().db_type(connection)
+        if db_type and connection.vendor == "sqlite":
+            db_type = "%s COLLATE NOCASE" % db_type
+        return db_type
+
+
+class CIExact(lookups.IExact):
+    def as_postgresql(self, compiler, connection):
+        if self.lhs.output_field.db_type(connection) == "citext":
+            return lookups.Exact(self.lhs, self.rhs).as_sql(compiler, connection)
+        return self.as_sql(compiler, connection)
+
+
+class CIIndex(models.Index):
+    """
+    An index on ``UPPER(column)``, matching the SQL of the case insensitive
+    lookups on PostgreSQL (without ``citext``) and Oracle. On SQLite and
+    MySQL a plain index is created.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor in ("sqlite", "mysql"):
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        quote_name = schema_editor.quote_name
+        columns = [model._meta.get_field(field_name).column for field_name, order in self.fields_orders]
+        return Statement(
+            "CREATE INDEX %(name)s ON %(table)s (%(columns)s)%(extra)s",
+            name=quote_name(self.name),
+            table=quote_name(model._meta.db_table),
+            columns=", ".join("UPPER(%s)" % quote_name(column) for column in columns),
+            extra=schema_editor._get_index_tablespace_sql(model, [], self.db_tablespace),
+        )
+
+
+class CIStringField(CIFieldMixin, CIText, StringField):  # noqa: F405
     pass
 
 
-class CIURLField(CIText, URLField):  # noqa: F405
+class CIURLField(CIFieldMixin, CIText, URLField):  # noqa: F405
     pass
 
 
-class CISlugField(CIText, SlugField):  # noqa: F405
+class CISlugField(CIFieldMixin, CIText, SlugField):  # noqa: F405
     pass
 
 
-class CIEmailField(CIText, EmailField):  # noqa: F405
+class CIEmailField(CIFieldMixin, CIText, EmailField):  # noqa: F405
     pass
 
 
 for field in [CIStringField, CIURLField, CISlugField, CIEmailField]:
-    field.register_lookup(lookups.IExact, lookup_name="exact")
+    field.register_lookup(CIExact, lookup_name="exact")
     field.register_lookup(lookups.IContains, lookup_name="contains")
     field.register_lookup(lookups.IStartsWith, lookup_name="startswith")
     field.register_lookup(lookups.IEndsWith, lookup_name="endswith")
@@ -18,16 +18,25 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import copy
 import re
+import threading
+import types
+import uuid
+import zlib
+from collections import Counter
+from functools import lru_cache
 
+import django
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, UserManager
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.core import validators
+from django.core import checks, validators
+from django.core.cache import cache
 from django.core.mail import send_mail
-from django.db import models
-from django.db.models import Max
-from django.template.defaultfilters import slugify
+from django.db import connections, models, router, transaction
+from django.db.models import DEFERRED, Max, Value, signals
+from django.db.models.functions import Concat, Length, Substr
 from django.utils import timezone
 from django.utils.http import urlquote
 from django.utils.translation import get_language, gettext_lazy as _
@@ -37,11 +46,22 @@ from fluo import settings
 from . import fields
 
 __all__ = [
+    "DirtyFieldsMixin",
+    "CombinedManager",
     "StatusModel",
+    "OrderedModelQuerySet",
+    "OrderedModelManager",
     "OrderedModel",
     "TreeOrderedModel",
+    "PathTreeOrderedModelQuerySet",
+    "PathTreeOrderedModelManager",
+    "PathTreeOrderedModel",
+    "TimestampQuerySet",
+    "TimestampManager",
     "TimestampModel",
     "I18NProxy",
+    "I18NModelQuerySet",
+    "I18NModelManager",
     "I18NModel",
     "TranslationModel",
     "CategoryModelManager",
@@ -54,6 +74,165 @@ __all__ = [
 ]
 
 
+class DirtyFieldsMixin:
+    """
+    Remember the values loaded from the database and, on save, write only
+    the changed columns (plus the auto updated ones, like
+    ``ModificationDateTimeField``), or nothing at all if nothing changed.
+
+    ``dirty_stats`` counts the ``skipped``, ``partial`` and ``full`` writes.
+    """
+
+    dirty_stats = Counter()
+
+    @staticmethod
+    def snapshot(values):
+        # mutable values (ie JSONField, ArrayField) are copied, so in place
+        # changes still compare as changed
+        return [copy.deepcopy(value) if isinstance(value, (dict, list, set, bytearray)) else value for value in values]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # field_names is shared by all the rows of a queryset
+        instance._loaded_values = (field_names, cls.snapshot(values))
+        return instance
+
+    def get_loaded_values(self):
+        loaded = getattr(self, "_loaded_values", None)
+        return dict(zip(*loaded)) if loaded is not None else None
+
+    def is_auto_updated(self, field):
+        return isinstance(field, fields.ModificationDateTimeField) or getattr(field, "auto_now", False)
+
+    def get_dirty_fields(self):
+        loaded = self.get_loaded_values()
+        if loaded is None:
+            return [field.name for field in self._meta.concrete_fields]
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                loaded.get(field.attname, DEFERRED) is DEFERRED or loaded[field.attname] != self.__dict__[field.attname]
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        names = [field.attname for field in self._meta.concrete_fields]
+        self._loaded_values = (names, self.snapshot([self.__dict__.get(name, DEFERRED) for name in names]))
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        loaded = self.get_loaded_values()
+        if loaded is None or update_fields:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        changed = [
+            (field, model, value)
+            for field, model, value in values
+            if not self.is_auto_updated(field)
+            and (
+                hasattr(value, "resolve_expression")
+                or loaded.get(field.attname, DEFERRED) is DEFERRED
+                or loaded[field.attname] != value
+            )
+        ]
+        if not changed:
+            # nothing is written, so the stamps set by pre_save() are undone
+            for field, model, value in values:
+                if self.is_auto_updated(field) and loaded.get(field.attname, DEFERRED) is not DEFERRED:
+                    setattr(self, field.attname, loaded[field.attname])
+            DirtyFieldsMixin.dirty_stats["skipped"] += 1
+            return True
+        changed += [item for item in values if self.is_auto_updated(item[0])]
+        DirtyFieldsMixin.dirty_stats["partial" if len(changed) < len(values) else "full"] += 1
+        return super()._do_update(base_qs, using, pk_val, changed, update_fields, forced_update)
+
+
+def get_combined_queryset_classes(model):
+    """
+    Return the queryset classes of the CombinedManagers declared by
+    ``model`` and its bases, in MRO order, skipping the ones another
+    of them already derives from.
+    """
+    classes = []
+    for base in model.__mro__:
+        meta = base.__dict__.get("_meta")
+        for manager in getattr(meta, "local_managers", []):
+            if isinstance(manager, CombinedManager) and manager._queryset_class not in classes:
+                classes.append(manager._queryset_class)
+    return tuple(
+        queryset_class
+        for queryset_class in classes
+        if not any(other is not queryset_class and issubclass(other, queryset_class) for other in classes)
+    )
+
+
+# the combined querysets live here, so they can be pickled by reference
+combined_querysets = types.SimpleNamespace()
+
+
+@lru_cache(maxsize=None)
+def combine_querysets(classes):
+    if len(classes) == 1:
+        return classes[0]
+    name = "".join(queryset_class.__name__ for queryset_class in classes)
+    while hasattr(combined_querysets, name):
+        name += "_"
+    queryset_class = type(name, classes, {"__module__": __name__, "__qualname__": "combined_querysets.%s" % name})
+    setattr(combined_querysets, name, queryset_class)
+    return queryset_class
+
+
+def get_combined_queryset(model):
+    return combine_querysets(get_combined_queryset_classes(model) or (models.QuerySet,))
+
+
+class CombinedManager(models.Manager):
+    """
+    A manager whose queryset derives from the querysets of all the
+    CombinedManagers of the model and its abstract bases.
+
+    OrderedModel, TimestampModel and I18NModel each declare ``objects``,
+    and a model deriving from more of them only inherits the first one:
+    with this manager it still reaches the methods of all of them.
+    """
+
+    def get_queryset(self):
+        return get_combined_queryset(self.model)(model=self.model, using=self._db, hints=self._hints)
+
+    def __getattr__(self, name):
+        # the methods of the querysets of the other bases
+        if name.startswith("_") or self.model is None:
+            raise AttributeError(name)
+        return getattr(self.get_queryset(), name)
+
+
+def prepare_combined_queryset(sender, **kwargs):
+    # build the combined class before any queryset is unpickled
+    if not sender._meta.abstract:
+        get_combined_queryset(sender)
+
+
+signals.class_prepared.connect(prepare_combined_queryset, dispatch_uid="fluo.db.models.prepare_combined_queryset")
+
+
+def check_default_queryset(model, queryset_class):
+    # a custom default manager can still miss the queryset of a base
+    manager = model._meta.default_manager
+    if manager is None or isinstance(manager.get_queryset(), queryset_class):
+        return []
+    return [
+        checks.Warning(
+            "The default manager of %s doesn't use %s." % (model._meta.label, queryset_class.__name__),
+            hint="Derive it from CombinedManager, ie CombinedManager.from_queryset(MyQuerySet), "
+            "or give it a queryset deriving from all the base querysets.",
+            obj=model,
+            id="fluo.W001",
+        ),
+    ]
+
+
 class StatusModel(models.Model):
     status = fields.StatusField()
 
@@ -61,7 +240,111 @@ class StatusModel(models.Model):
         abstract = True
 
 
+def lock_ordering(queryset):
+    """
+    Lock the rows of ``queryset`` until the end of the transaction.
+
+    Returns the list of ``(pk, ordering)`` in ordering order.
+    """
+    return list(queryset.select_for_update().order_by("ordering", "pk").values_list("pk", "ordering"))
+
+
+def lock_ordering_group(obj, using):
+    """
+    Serialize the writers of the siblings of ``obj`` until the end of the
+    transaction, even when the group is still empty.
+
+    PostgreSQL takes a transaction level advisory lock on the group; the
+    other backends lock the single row returned by
+    ``obj.get_ordering_lock_queryset()`` (InnoDB also locks the index gap
+    after it), and SQLite needs nothing as it allows one writer at a time.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        key = zlib.crc32(("%s:%s" % (obj._meta.label_lower, obj.ordering_group)).encode())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+    elif connection.features.has_select_for_update:
+        list(obj.get_ordering_lock_queryset(using).select_for_update().values_list("pk", flat=True))
+
+
+class OrderedModelQuerySet(models.QuerySet):
+    def renumber(self, pks, rows=None):
+        """
+        Assign ``ordering`` 1..n following the ``pks`` order.
+
+        Only the rows whose ordering really changes are written, with a
+        single ``UPDATE ... CASE`` statement per batch.
+        """
+        if rows is None:
+            rows = self.filter(pk__in=pks).values_list("pk", "ordering")
+        current = dict(rows)
+        objs = [
+            self.model(pk=pk, ordering=ordering)
+            for ordering, pk in enumerate(pks, start=1)
+            if current.get(pk, ordering) != ordering
+        ]
+        if objs:
+            self.bulk_update(objs, ["ordering"])
+        return len(objs)
+
+    def reorder(self, pks):
+        """
+        Reorder the rows of the queryset following the given primary keys.
+        """
+        with transaction.atomic(using=self.db):
+            rows = lock_ordering(self.filter(pk__in=pks))
+            return self.renumber(list(pks), rows)
+
+    def move_to(self, obj, position):
+        """
+        Move ``obj`` at ``position`` (0 based) among its siblings.
+        """
+        with transaction.atomic(using=self.db):
+            lock_ordering_group(obj, self.db)
+            rows = lock_ordering(obj.brothers_and_me.using(self.db))
+            pks = [pk for pk, ordering in rows if pk != obj.pk]
+            pks.insert(max(0, min(position, len(pks))), obj.pk)
+            self.renumber(pks, rows)
+            obj.ordering = pks.index(obj.pk) + 1
+
+    def move_above(self, obj, target):
+        with transaction.atomic(using=self.db):
+            pks = [pk for pk, ordering in lock_ordering(obj.brothers_and_me.using(self.db)) if pk != obj.pk]
+            self.move_to(obj, pks.index(target.pk))
+
+    def move_below(self, obj, target):
+        with transaction.atomic(using=self.db):
+            pks = [pk for pk, ordering in lock_ordering(obj.brothers_and_me.using(self.db)) if pk != obj.pk]
+            self.move_to(obj, pks.index(target.pk) + 1)
+
+    def bulk_create_ordered(self, objs, batch_size=None):
+        """
+        Like ``bulk_create``, but append the objects without an ordering after
+        their siblings, reading the max ordering once per group of siblings.
+        """
+        objs = list(objs)
+        groups = {}
+        for obj in objs:
+            if not obj.ordering:
+                groups.setdefault(obj.ordering_group, []).append(obj)
+        with transaction.atomic(using=self.db):
+            for group in groups.values():
+                lock_ordering_group(group[0], self.db)
+                ordering = group[0].get_max_ordering(self.db)
+                for obj in group:
+                    ordering += 1
+                    obj.ordering = ordering
+            return self.bulk_create(objs, batch_size=batch_size)
+
+
+class OrderedModelManager(CombinedManager.from_queryset(OrderedModelQuerySet)):
+    pass
+
+
 class OrderedModel(models.Model):
+    objects = OrderedModelManager()
+
     ordering = fields.OrderField(
         default=0,
         blank=True,
@@ -74,10 +357,18 @@ class OrderedModel(models.Model):
         abstract = True
         ordering = ["-ordering"]
 
+    @classmethod
+    def check(cls, **kwargs):
+        return [*super().check(**kwargs), *check_default_queryset(cls, OrderedModelQuerySet)]
+
     def save(self, *args, **kwargs):
-        if not self.ordering:
-            self.ordering = self.get_max_ordering() + 1
-        super().save(*args, **kwargs)
+        if self.ordering:
+            return super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            lock_ordering_group(self, using)
+            self.ordering = self.get_max_ordering(using) + 1
+            super().save(*args, **kwargs)
 
     @property
     def brothers_and_me(self):
@@ -87,8 +378,25 @@ class OrderedModel(models.Model):
     def brothers(self):
         return self.brothers_and_me.exclude(pk=self.id)
 
-    def get_max_ordering(self):
-        ordering = self.brothers.aggregate(max=Max("ordering"))["max"]
+    @property
+    def ordering_group(self):
+        """
+        A key shared by all the siblings, used to group bulk operations.
+        """
+        return None
+
+    def get_ordering_lock_queryset(self, using):
+        """
+        Return the row locked to append to the siblings: the last one.
+        """
+        if not connections[using].features.supports_select_for_update_with_limit:
+            # ie Oracle: no bounded row to lock
+            return self.brothers_and_me.none()
+        return self.brothers_and_me.using(using).order_by("-ordering", "-pk")[:1]
+
+    def get_max_ordering(self, using=None):
+        brothers = self.brothers if using is None else self.brothers.using(using)
+        ordering = brothers.aggregate(max=Max("ordering"))["max"]
         return 0 if ordering is None else ordering
 
 
@@ -113,38 +421,348 @@ class TreeOrderedModel(OrderedModel):
         else:
             return self.__class__._default_manager.filter(parent__isnull=True)
 
+    @property
+    def ordering_group(self):
+        return self.parent_id
+
+    def get_ordering_lock_queryset(self, using):
+        # the parent row exists even when it has no children yet
+        if self.parent_id is not None:
+            return self.__class__._base_manager.using(using).filter(pk=self.parent_id)
+        return super().get_ordering_lock_queryset(using)
+
+
+class PathTreeOrderedModelQuerySet(OrderedModelQuerySet):
+    def descendants(self, obj, include_self=False):
+        queryset = self.filter(path__startswith=obj.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=obj.pk)
+        return queryset.order_by("ordering", "pk")
+
+    def ancestors(self, obj, include_self=False):
+        pks = obj.path_pks
+        if not include_self:
+            pks = pks[:-1]
+        return self.filter(pk__in=pks).order_by(Length("path"))
+
+    def siblings(self, obj, include_self=False):
+        queryset = self.filter(parent_id=obj.parent_id)
+        if not include_self:
+            queryset = queryset.exclude(pk=obj.pk)
+        return queryset.order_by("ordering", "pk")
+
+    def renumber(self, pks, rows=None):
+        count = super().renumber(pks, rows)
+        if count:
+            self.update_paths(pks)
+        return count
+
+    def update_paths(self, pks):
+        """
+        Recompute the path of the ``pks`` nodes, ie after a change of their
+        ordering, with one ``UPDATE`` for each node moving its descendants
+        along.
+        """
+        manager = self.model._default_manager.db_manager(self.db)
+        # ancestors first, so the children get the new path of their parent
+        nodes = sorted(
+            manager.filter(pk__in=pks).values_list("pk", "parent_id", "ordering", "path"),
+            key=lambda node: node[3].count("/"),
+        )
+        parents = dict(manager.filter(pk__in={node[1] for node in nodes}).values_list("pk", "path"))
+        paths = []
+        for pk, parent_id, ordering, old_path in nodes:
+            prefix = parents.get(parent_id, "/") if parent_id is not None else "/"
+            parents[pk] = path = prefix + self.model.path_segment(pk, ordering)
+            if path != old_path:
+                paths.append((old_path, path))
+        # descendants first, their new path already has the new prefix of
+        # their ancestors
+        for old_path, path in reversed(paths):
+            manager.filter(path__startswith=old_path).update(
+                path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+            )
+
+    def get_tree(self, obj=None):
+        """
+        Return the nodes (the subtree of ``obj`` if given) in depth-first
+        order, siblings sorted by ``ordering``, fetched with a single query.
+        """
+        nodes = list(self.descendants(obj, include_self=True) if obj is not None else self.order_by("ordering", "pk"))
+        pks = {node.pk for node in nodes}
+        children = {}
+        for node in nodes:
+            children.setdefault(node.parent_id if node.parent_id in pks else None, []).append(node)
+        tree = []
+        stack = list(reversed(children.get(None, [])))
+        while stack:
+            node = stack.pop()
+            tree.append(node)
+            stack.extend(reversed(children.get(node.pk, [])))
+        return tree
+
+    def rebuild_paths(self):
+        """
+        Compute the path of every node, useful after adding the ``path``
+        column to an existing table.
+        """
+        nodes = {
+            pk: (parent_id, ordering) for pk, parent_id, ordering in self.values_list("pk", "parent_id", "ordering")
+        }
+        paths = {}
+
+        def get_path(pk):
+            if pk not in paths:
+                parent_id, ordering = nodes[pk]
+                prefix = get_path(parent_id) if parent_id in nodes else "/"
+                paths[pk] = prefix + self.model.path_segment(pk, ordering)
+            return paths[pk]
+
+        objs = [self.model(pk=pk, path=get_path(pk)) for pk in nodes]
+        self.bulk_update(objs, ["path"])
+        return len(objs)
+
+
+class PathTreeOrderedModelManager(CombinedManager.from_queryset(PathTreeOrderedModelQuerySet)):
+    pass
+
+
+class PathTreeOrderedModel(TreeOrderedModel):
+    """
+    A TreeOrderedModel which keeps the materialized path of the ordering and
+    primary key of its ancestors (``/0000000002-0000000001/0000000001-0000000005/``),
+    so subtrees and ancestors can be fetched with a single indexed query, and
+    ordering by ``path`` lists the tree depth first, siblings by ordering.
+    """
+
+    objects = PathTreeOrderedModelManager()
+
+    path = fields.StringField(max_length=255, default="", db_index=True, editable=False, verbose_name=_("path"))
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def path_segment(cls, pk, ordering=0):
+        return "%010d-%s/" % (ordering or 0, "%010d" % pk if isinstance(pk, int) else pk)
+
+    @property
+    def path_pks(self):
+        to_python = self._meta.pk.to_python
+        return [to_python(segment.partition("-")[2]) for segment in self.path.strip("/").split("/") if segment]
+
+    @property
+    def depth(self):
+        return self.path.count("/") - 2
+
+    def build_path(self):
+        prefix = self.parent.path if self.parent_id is not None else "/"
+        return prefix + self.path_segment(self.pk, self.ordering)
+
+    def save(self, *args, **kwargs):
+        old_path = self.path
+        super().save(*args, **kwargs)
+        path = self.build_path()
+        if path != old_path:
+            self.path = path
+            queryset = self.__class__._default_manager.using(kwargs.get("using") or self._state.db)
+            queryset.filter(pk=self.pk).update(path=path)
+            if old_path:
+                queryset.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                )
+
+
+class TimestampQuerySet(models.QuerySet):
+    """
+    ``bulk_create``, ``bulk_update`` and ``update`` stamp the creation and
+    modification fields, as ``save()`` does.
+    """
+
+    def get_timestamp_fields(self):
+        creation, modification = [], []
+        for field in self.model._meta.concrete_fields:
+            if isinstance(field, fields.ModificationDateTimeField):
+                modification.append(field)
+            elif isinstance(field, fields.CreationDateTimeField):
+                creation.append(field)
+        return creation, modification
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        now = timezone.now()
+        for field in self.get_timestamp_fields()[0]:
+            for obj in objs:
+                if getattr(obj, field.attname) is None:
+                    setattr(obj, field.attname, now)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        fields = list(fields)
+        now = timezone.now()
+        for field in self.get_timestamp_fields()[1]:
+            for obj in objs:
+                setattr(obj, field.attname, now)
+            if field.name not in fields:
+                fields.append(field.name)
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
+
+    def update(self, **kwargs):
+        now = timezone.now()
+        for field in self.get_timestamp_fields()[1]:
+            if field.name not in kwargs and field.attname not in kwargs:
+                kwargs[field.name] = now
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+
+class TimestampManager(CombinedManager.from_queryset(TimestampQuerySet)):
+    pass
+
 
 class TimestampModel(models.Model):
+    objects = TimestampManager()
+
     created_at = fields.CreationDateTimeField(verbose_name=_("created"))
     last_modified_at = fields.ModificationDateTimeField(verbose_name=_("modified"))
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def check(cls, **kwargs):
+        return [*super().check(**kwargs), *check_default_queryset(cls, TimestampQuerySet)]
+
+
+@lru_cache(maxsize=None)
+def get_translatable_fields(translation_model, model):
+    """
+    Return the names of the fields a translation can override on ``model``.
+    """
+    return frozenset(
+        field.attname
+        for field in translation_model._meta.concrete_fields
+        if not field.primary_key
+        and field.name != "language"
+        and not (field.is_relation and issubclass(model, field.related_model))
+    )
+
 
 class I18NProxy:
+    __slots__ = ("_tr", "_original", "_fields", "_cache")
+
     def __init__(self, tr, original):
         self._tr = tr
         self._original = original
+        self._fields = get_translatable_fields(type(tr), type(original))
+        self._cache = {}
 
     def __getattr__(self, name):
-        attr = getattr(self._tr, name, None)
-        if not attr or (attr and (attr == "" or attr == "")):
-            attr = getattr(self._original, name)
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        if name in self._fields:
+            attr = getattr(self._tr, name)
+            if not attr:
+                attr = getattr(self._original, name)
+        else:
+            try:
+                attr = getattr(self._original, name)
+            except AttributeError:
+                attr = getattr(self._tr, name)
+        self._cache[name] = attr
         return attr
 
+    def __setattr__(self, name, value):
+        # like an instance attribute, the value stays on the proxy and hides
+        # the translated and the original ones
+        if name in I18NProxy.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            self._cache[name] = value
+
+    def __delattr__(self, name):
+        if name in I18NProxy.__slots__:
+            object.__delattr__(self, name)
+        else:
+            try:
+                del self._cache[name]
+            except KeyError:
+                raise AttributeError(name) from None
+
+    def __eq__(self, other):
+        if isinstance(other, I18NProxy):
+            return self._original == other._original and self._tr == other._tr
+        return self._original == other
+
+    def __hash__(self):
+        return hash(self._original)
+
+    def __str__(self):
+        method = type(self._original).__str__
+        if method is models.Model.__str__:
+            return str(self._original)
+        return method(self)
+
+    def __repr__(self):
+        return "<%s: %s>" % (self.__class__.__name__, self)
+
+
+def get_translation_attr(language):
+    return "_translations_%s" % language
+
+
+class I18NModelQuerySet(models.QuerySet):
+    def translated(self, language=None):
+        """
+        Prefetch the translations in ``language`` for the whole queryset with
+        one query, so ``translate()`` does not hit the database again.
+        """
+        language = language or get_language()[:2]
+        model = self.model._meta.get_field("translations").related_model
+        return self.prefetch_related(
+            models.Prefetch(
+                "translations",
+                queryset=model._default_manager.filter(language__startswith=language),
+                to_attr=get_translation_attr(language),
+            ),
+        )
+
+
+class I18NModelManager(CombinedManager.from_queryset(I18NModelQuerySet)):
+    pass
+
 
 class I18NModel(models.Model):
+    objects = I18NModelManager()
+
+    # "hits" are translations served by translated(), "misses" needed a query
+    translation_stats = Counter()
+
     def translate(self, language=None):
         try:
             language = language or get_language()[:2]
-            return I18NProxy(self.translations.get(language__startswith=language), self)
+            prefetched = getattr(self, get_translation_attr(language), None)
+            if prefetched is None:
+                I18NModel.translation_stats["misses"] += 1
+                return I18NProxy(self.translations.get(language__startswith=language), self)
+            I18NModel.translation_stats["hits"] += 1
+            return I18NProxy(prefetched[0], self) if prefetched else self
         except (models.ObjectDoesNotExist, AttributeError, TypeError):
             return self
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def check(cls, **kwargs):
+        return [*super().check(**kwargs), *check_default_queryset(cls, I18NModelQuerySet)]
+
 
 class TranslationModel(models.Model):
     language = models.CharField(max_length=5, choices=settings.LANGUAGES, db_index=True, verbose_name=_("language"))
@@ -154,9 +772,107 @@ class TranslationModel(models.Model):
         ordering = ["language"]
 
 
-class CategoryModelQuerySet(models.QuerySet):
+class DefaultCategoryCache:
+    """
+    Memo of the default category of each CategoryModel subclass.
+
+    Values are kept both in process and in the django cache, under a
+    version token shared through the django cache: changing the token
+    invalidates the copies held by every worker. Without a token (ie with
+    the ``DummyCache``) nothing is cached.
+
+    A change is seen at once by the transaction making it, which reads the
+    database until it ends, and by the other workers once committed.
+    """
+
+    prefix = "fluo:category-default"
+
+    def __init__(self):
+        self.local = {}
+        self.pending = threading.local()
+
+    def get_key(self, model, using):
+        return "%s:%s:%s" % (self.prefix, using, model._meta.label_lower)
+
+    def get_version(self, key):
+        version = cache.get("%s:version" % key)
+        if version is None:
+            cache.add("%s:version" % key, uuid.uuid4().hex, None)
+            version = cache.get("%s:version" % key)
+        return version
+
+    def get_pending(self):
+        try:
+            return self.pending.keys
+        except AttributeError:
+            self.pending.keys = set()
+            return self.pending.keys
+
+    def is_pending(self, key, using):
+        pending = self.get_pending()
+        if key in pending and not transaction.get_connection(using).in_atomic_block:
+            # the transaction has been rolled back
+            pending.discard(key)
+        return key in pending
+
+    def get(self, queryset):
+        model = queryset.model
+        key = self.get_key(model, queryset.db)
+        if self.is_pending(key, queryset.db):
+            return queryset.get(default=True)
+        version = self.get_version(key)
+        if version is None:
+            return queryset.get(default=True)
+        names = [field.attname for field in model._meta.concrete_fields]
+        local = self.local.get(key)
+        if local is not None and local[0] == version:
+            values = local[1]
+        else:
+            values = cache.get("%s:%s" % (key, version))
+            if values is None:
+                obj = queryset.get(default=True)
+                values = [getattr(obj, name) for name in names]
+                cache.set("%s:%s" % (key, version), values)
+                self.local[key] = (version, values)
+                return obj
+            self.local[key] = (version, values)
+        return model.from_db(queryset.db, names, values)
+
+    def invalidate(self, model, using):
+        """
+        Forget the default category of ``model`` now for this transaction,
+        and for everybody when it is committed.
+        """
+        key = self.get_key(model, using)
+        self.local.pop(key, None)
+        if transaction.get_connection(using).in_atomic_block:
+            self.get_pending().add(key)
+        transaction.on_commit(lambda: self.publish(key), using=using)
+
+    def publish(self, key):
+        self.get_pending().discard(key)
+        self.local.pop(key, None)
+        cache.set("%s:version" % key, uuid.uuid4().hex, None)
+
+
+default_category_cache = DefaultCategoryCache()
+
+
+class CategoryModelQuerySet(OrderedModelQuerySet):
     def default(self):
-        return self.get(default=True)
+        # only the plain "all categories" lookup is cached
+        if self.query.where:
+            return self.get(default=True)
+        return default_category_cache.get(self)
+
+    def warm_default(self):
+        """
+        Load the default category in the caches, to be called at startup.
+        """
+        try:
+            return self.default()
+        except models.ObjectDoesNotExist:
+            return None
 
     def active(self):
         return self.filter(status=fields.STATUS_ACTIVE)
@@ -165,7 +881,7 @@ class CategoryModelQuerySet(models.QuerySet):
         return self.filter(status=fields.STATUS_INACTIVE)
 
 
-class CategoryModelManager(models.Manager.from_queryset(CategoryModelQuerySet)):
+class CategoryModelManager(CombinedManager.from_queryset(CategoryModelQuerySet)):
     use_for_related_fields = True
     silence_use_for_related_fields_deprecation = True
 
@@ -174,8 +890,10 @@ class CategoryModel(StatusModel, OrderedModel):
     objects = CategoryModelManager()
 
     name = models.CharField(unique=True, max_length=255)
-    slug = models.SlugField(
+    slug = fields.SlugField(
+        max_length=50,
         unique=True,
+        populate_from="name",
         editable=False,
         verbose_name=_("slug"),
         help_text=_(
@@ -188,24 +906,49 @@ class CategoryModel(StatusModel, OrderedModel):
         abstract = True
         base_manager_name = "objects"
         ordering = ["name"]
+        # %(app_label)s/%(class)s in constraint names need Django >= 3.0,
+        # before they would give every subclass the same name
+        constraints = (
+            [
+                models.UniqueConstraint(
+                    fields=["default"],
+                    condition=models.Q(default=True),
+                    name="%(app_label)s_%(class)s_unique_default",
+                ),
+            ]
+            if django.VERSION >= (3, 0)
+            else []
+        )
 
     def __str__(self):
         return self.name
 
     def save(self, *args, **kwargs):
-        self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-        if self.default:
-            for c in self.__class__._default_manager.exclude(pk=self.id):
-                c.default = False
-                c.save(*args, **kwargs)
-        try:
-            c = self.__class__._default_manager.get(default=True)
-        except models.ObjectDoesNotExist:
-            self.default = True
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        others = self.__class__._default_manager.using(using).filter(default=True).exclude(pk=self.pk)
+        with transaction.atomic(using=using):
+            # keep exactly one default category
+            if self.default:
+                others.update(default=False)
+            elif not others.exists():
+                self.default = True
             super().save(*args, **kwargs)
 
 
+def invalidate_default_category(sender, instance, using, **kwargs):
+    default_category_cache.invalidate(sender, using)
+
+
+def connect_default_category(sender, **kwargs):
+    if issubclass(sender, CategoryModel) and not sender._meta.abstract:
+        dispatch_uid = "fluo.db.models.invalidate_default_category.%s" % sender._meta.label_lower
+        signals.post_save.connect(invalidate_default_category, sender=sender, dispatch_uid=dispatch_uid)
+        signals.post_delete.connect(invalidate_default_category, sender=sender, dispatch_uid=dispatch_uid)
+
+
+signals.class_prepared.connect(connect_default_category, dispatch_uid="fluo.db.models.connect_default_category")
+
+
 class CategoryTranslationModel(TranslationModel):
     name = models.CharField(max_length=255)
 
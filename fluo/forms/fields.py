@@ -21,7 +21,8 @@
 # JsonField taken and adapted from https://github.com/bradjasper/django-jsonfield.git
 # Copyright (c) 2012 Brad Jasper
 
-from operator import add, mul
+import datetime
+from decimal import Decimal, InvalidOperation
 
 from django import forms
 from django.core.exceptions import ValidationError
@@ -38,6 +39,7 @@ __all__ = [
     "TextField",
     "GroupedChoiceField",
     "TimeDeltaField",
+    "NativeTimeDeltaField",
     "JsonField",
 ]
 
@@ -108,7 +110,7 @@ class TimeDeltaField(forms.MultiValueField):
     """Input accurate timing. Interface with models.TimeDeltaField."""
 
     LABELS = [_("Hours"), _("Minutes"), _("Seconds"), _("Milliseconds")]
-    SECONDS = [60 * 60, 60, 1, 0.001]
+    SECONDS = [60 * 60, 60, 1, Decimal("0.001")]
 
     def __init__(self, milliseconds=True, *args, **kwargs):
         if not milliseconds:
@@ -119,13 +121,27 @@ class TimeDeltaField(forms.MultiValueField):
         super().__init__(fields, *args, **kwargs)
 
     def compress(self, value):
-        from functools import reduce
-
         if value:
-            return "{}".format(reduce(add, map(lambda x: mul(*x), zip(map(float, value), self.SECONDS))))
+            try:
+                return "{}".format(sum(Decimal(bit or 0) * seconds for bit, seconds in zip(value, self.SECONDS)))
+            except InvalidOperation:
+                raise ValidationError(_("Enter a valid duration."), code="invalid")
         return None
 
 
+class NativeTimeDeltaField(TimeDeltaField):
+    """Clean to a ``datetime.timedelta``. Interface with models.NativeTimeDeltaField."""
+
+    def compress(self, value):
+        seconds = super().compress(value)
+        if seconds is None:
+            return None
+        try:
+            return datetime.timedelta(microseconds=int(Decimal(seconds) * 1000000))
+        except OverflowError:
+            raise ValidationError(_("Enter a valid duration."), code="invalid")
+
+
 class JsonField(forms.CharField):
     def to_python(self, value):
         if isinstance(value, str):
@@ -216,6 +216,8 @@ class TimeDeltaWidget(forms.MultiWidget):
         return mark_safe("".join(widgets))
 
     def decompress(self, value):
+        if isinstance(value, datetime.timedelta):
+            value = value.total_seconds()
         if value:
             return [
                 "%02d" % (value / 3600),
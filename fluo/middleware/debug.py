@@ -18,8 +18,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-import sys
-
 from django.http import Http404
 from django.utils.deprecation import MiddlewareMixin
 from django.views.debug import technical_404_response, technical_500_response
@@ -30,4 +28,8 @@ class UserBasedExceptionMiddleware(MiddlewareMixin):
         if request.user.is_superuser:
             if isinstance(exception, Http404):
                 return technical_404_response(request, exception)
-            return technical_500_response(request, *sys.exc_info())
+            # sys.exc_info() is empty when called from a sync_to_async thread
+            return technical_500_response(request, type(exception), exception, exception.__traceback__)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
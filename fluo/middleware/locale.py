@@ -23,45 +23,208 @@
 
 "this is the locale selecting middleware that will look at accept headers"
 
+import codecs
 import re
+from functools import lru_cache
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.http import HttpResponseRedirect
 from django.utils import translation
 from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.encoding import iri_to_uri
+from django.utils.functional import cached_property
 
-from fluo.settings import NO_LOCALE_PATTERNS
+ROUTER_SETTINGS = {"LANGUAGES", "LANGUAGE_CODE", "MEDIA_URL", "STATIC_URL", "NO_LOCALE_PATTERNS"}
+REGEX_CHARS = set(".^$*+?{}[]\\|()")
 
-SUB = re.compile(
-    r'<a([^>]+)href="/(?!(%s|%s|%s))([^"]*)"([^>]*)>'
-    % ("|".join(map(lambda l: l[0] + "/", settings.LANGUAGES)), settings.MEDIA_URL[1:], settings.STATIC_URL[1:]),
-)
-SUB2 = re.compile(
-    r'<form([^>]+)action="/(?!(%s|%s|%s))([^"]*)"([^>]*)>'
-    % ("|".join(map(lambda l: l[0] + "/", settings.LANGUAGES)), settings.MEDIA_URL[1:], settings.STATIC_URL[1:]),
-)
-SUPPORTED = dict(settings.LANGUAGES)
-START_SUB = re.compile(r"^/(%s)/(.*)" % "|".join(map(lambda l: l[0], settings.LANGUAGES)))
-NO_LOCALE_SUB = re.compile(r"^(%s|%s)(.*)" % ("|".join(NO_LOCALE_PATTERNS), settings.STATIC_URL))
-LANGUAGE_COOKIE_NAME = settings.LANGUAGE_COOKIE_NAME
 
+def is_literal(pattern):
+    return not REGEX_CHARS.intersection(pattern)
 
-def has_lang_prefix(path):
-    check = START_SUB.match(path)
-    if check is not None:
-        return check.group(1)
-    else:
+
+class LocaleRouter:
+    """
+    Compiled lookup tables for the language prefix and the no-locale paths.
+
+    Language prefixes are resolved with a single dict lookup on the first
+    path segment, literal no-locale prefixes with a character trie (regex
+    patterns fall back to a compiled regex). Results are cached per path,
+    and everything is rebuilt when the relevant settings change.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.reset()
+
+    def reset(self):
+        for name in ("codes", "default_language", "no_locale_patterns", "trie", "no_locale_sub", "link_sub"):
+            self.__dict__.pop(name, None)
+        self.lang_prefix = lru_cache(maxsize=self.maxsize)(self._lang_prefix)
+        self.skip_translation = lru_cache(maxsize=self.maxsize)(self._skip_translation)
+        self.match_language = lru_cache(maxsize=self.maxsize)(self._match_language)
+
+    @cached_property
+    def codes(self):
+        return frozenset(code for code, name in settings.LANGUAGES)
+
+    @cached_property
+    def default_language(self):
+        return self.match_language(settings.LANGUAGE_CODE)
+
+    @cached_property
+    def no_locale_patterns(self):
+        patterns = [iri_to_uri(settings.MEDIA_URL)]
+        patterns += list(getattr(settings, "NO_LOCALE_PATTERNS", []))
+        patterns.append(iri_to_uri(settings.STATIC_URL))
+        return patterns
+
+    @cached_property
+    def trie(self):
+        trie = {}
+        for pattern in self.no_locale_patterns:
+            if pattern and is_literal(pattern):
+                node = trie
+                for char in pattern:
+                    node = node.setdefault(char, {})
+                node.setdefault(None, pattern)
+        return trie
+
+    @cached_property
+    def no_locale_sub(self):
+        patterns = [pattern for pattern in self.no_locale_patterns if pattern and not is_literal(pattern)]
+        if patterns:
+            return re.compile(r"^(%s)" % "|".join(patterns))
+
+    @cached_property
+    def link_sub(self):
+        return re.compile(
+            r'<(?:a(?P<a>[^>]+)href|form(?P<form>[^>]+)action)="/(?!(?:%s|%s|%s))(?P<path>[^"]*)"(?P<tail>[^>]*)>'
+            % (
+                "|".join(re.escape(code + "/") for code in self.codes),
+                re.escape(settings.MEDIA_URL[1:]),
+                re.escape(settings.STATIC_URL[1:]),
+            ),
+        )
+
+    def _lang_prefix(self, path):
+        bits = path.split("/", 2)
+        if len(bits) == 3 and not bits[0] and bits[1] in self.codes:
+            return bits[1]
         return False
 
+    def _skip_translation(self, path):
+        node = self.trie
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                return node[None]
+        if self.no_locale_sub is not None:
+            check = self.no_locale_sub.match(path)
+            if check is not None:
+                return check.group(1)
+        return False
+
+    def _match_language(self, language_code):
+        # first try if there is an exact language
+        if language_code in self.codes:
+            return language_code
+
+        # otherwise split the language code if possible, so iso3
+        language_code = language_code.split("-")[0]
+
+        if language_code not in self.codes:
+            raise ImproperlyConfigured("No match in LANGUAGES for LANGUAGE_CODE %s" % settings.LANGUAGE_CODE)
+
+        return language_code
+
+
+router = LocaleRouter()
+
+
+def reset_router(*, setting, **kwargs):
+    if setting in ROUTER_SETTINGS:
+        router.reset()
+
+
+setting_changed.connect(reset_router, dispatch_uid="fluo.middleware.locale.reset_router")
+
+
+class LinkRewriter:
+    """
+    Prefix local ``<a href>`` and ``<form action>`` urls with the language code.
+
+    The body is fed chunk by chunk, an unterminated tag at the end of a chunk
+    is kept back and rewritten together with the next one.
+    """
+
+    def __init__(self, language_code, charset="utf-8"):
+        self.language_code = language_code
+        self.charset = charset
+        self.decoder = codecs.getincrementaldecoder(charset)()
+        self.pending = ""
+
+    def replace(self, match):
+        if match.group("a") is not None:
+            return '<a%shref="/%s/%s"%s>' % (
+                match.group("a"),
+                self.language_code,
+                match.group("path"),
+                match.group("tail"),
+            )
+        return '<form%saction="/%s/%s"%s>' % (
+            match.group("form"),
+            self.language_code,
+            match.group("path"),
+            match.group("tail"),
+        )
+
+    def feed(self, chunk, final=False):
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final)
+        text = self.pending + chunk
+        self.pending = ""
+        if not final:
+            start = text.rfind("<")
+            if start != -1 and text.find(">", start) == -1:
+                text, self.pending = text[:start], text[start:]
+        return router.link_sub.sub(self.replace, text).encode(self.charset)
+
+    def close(self):
+        return self.feed(b"", final=True)
+
+    def rewrite(self, content):
+        return self.feed(content, final=True)
+
+    def iter_rewrite(self, chunks):
+        for chunk in chunks:
+            data = self.feed(chunk)
+            if data:
+                yield data
+        data = self.close()
+        if data:
+            yield data
+
+    async def aiter_rewrite(self, chunks):
+        async for chunk in chunks:
+            data = self.feed(chunk)
+            if data:
+                yield data
+        data = self.close()
+        if data:
+            yield data
+
+
+def has_lang_prefix(path):
+    return router.lang_prefix(path)
+
 
 def skip_translation(path):
-    check = NO_LOCALE_SUB.match(path)
-    if check is not None:
-        return check.group(1)
-    else:
-        return False
+    return router.skip_translation(path)
 
 
 def get_default_language(language_code=None):
@@ -75,71 +238,93 @@ def get_default_language(language_code=None):
     """
 
     if not language_code:
-        language_code = settings.LANGUAGE_CODE
+        return router.default_language
+    return router.match_language(language_code)
 
-    languages = dict(settings.LANGUAGES).keys()
 
-    # first try if there is an exact language
-    if language_code in languages:
-        return language_code
+class RequestLanguage:
+    """
+    Language sources of a request, each one read at most once.
 
-    # otherwise split the language code if possible, so iso3
-    language_code = language_code.split("-")[0]
+    An instance is stored on the request by ``get_request_language`` and
+    shared by the middleware, the template tags and the views.
+    """
 
-    if language_code not in languages:
-        raise ImproperlyConfigured("No match in LANGUAGES for LANGUAGE_CODE %s" % settings.LANGUAGE_CODE)
+    def __init__(self, request):
+        self.request = request
 
-    return language_code
+    @cached_property
+    def requested(self):
+        language = self.request.GET.get("language", self.request.POST.get("language", None))
+        return language if language in router.codes else None
 
+    @cached_property
+    def session(self):
+        if hasattr(self.request, "session"):
+            return self.request.session.get("django_language", None)
 
-def get_language_from_request(request):
-    language = request.GET.get("language", request.POST.get("language", None))
+    @cached_property
+    def cookie(self):
+        return self.request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME, None)
+
+    @cached_property
+    def accept(self):
+        return translation.get_language_from_request(self.request)
 
-    if language:
-        if language not in dict(settings.LANGUAGES).keys():
-            language = None
+    @cached_property
+    def code(self):
+        language = self.requested
+        if language is None:
+            language = getattr(self.request, "LANGUAGE_CODE", None)
+            if language not in router.codes:
+                language = None
+        if language is None:
+            language = router.default_language
+        return language
 
-    if language is None:
-        language = getattr(request, "LANGUAGE_CODE", None)
 
-    if language:
-        if language not in dict(settings.LANGUAGES).keys():
-            language = None
+def get_request_language(request):
+    try:
+        return request._fluo_language
+    except AttributeError:
+        request._fluo_language = RequestLanguage(request)
+        return request._fluo_language
 
-    if language is None:
-        language = get_default_language()
 
-    return language
+def get_language_from_request(request):
+    return get_request_language(request).code
 
 
 class LocaleMiddleware(MiddlewareMixin):
     def get_language_from_request(self, request):
+        resolved = get_request_language(request)
         changed = False
         prefix = has_lang_prefix(request.path_info)
         if prefix:
             request.path = "/" + "/".join(request.path.split("/")[2:])
             request.path_info = "/" + "/".join(request.path_info.split("/")[2:])
             t = prefix
-            if t in SUPPORTED:
+            if t in router.codes:
                 lang = t
                 if hasattr(request, "session"):
                     request.session["django_language"] = lang
+                    resolved.session = lang
                 else:
-                    request.set_cookie(LANGUAGE_COOKIE_NAME, lang)
+                    request.set_cookie(settings.LANGUAGE_COOKIE_NAME, lang)
                 changed = True
         else:
-            lang = translation.get_language_from_request(request)
+            lang = resolved.accept
         if not changed:
             if hasattr(request, "session"):
-                lang = request.session.get("django_language", None)
-                if lang in SUPPORTED and lang is not None:
+                lang = resolved.session
+                if lang in router.codes:
                     return lang
-            elif LANGUAGE_COOKIE_NAME in request.COOKIES.keys():
-                lang = request.COOKIES.get(LANGUAGE_COOKIE_NAME, None)
-                if lang in SUPPORTED and lang is not None:
+            elif settings.LANGUAGE_COOKIE_NAME in request.COOKIES:
+                lang = resolved.cookie
+                if lang in router.codes:
                     return lang
             if not lang:
-                lang = translation.get_language_from_request(request)
+                lang = resolved.accept
         lang = get_default_language(lang)
         return lang
 
@@ -168,14 +353,19 @@ class LocaleMiddleware(MiddlewareMixin):
             and response.status_code == 200
             and response._headers["content-type"][1].split(";")[0] == "text/html"
         ):
-            response.content = SUB.sub(
-                r'<a\1href="/%s/\3"\4>' % request.LANGUAGE_CODE,
-                response.content.decode("utf-8"),
-            )
-            response.content = SUB2.sub(
-                r'<form\1action="/%s/\3"\4>' % request.LANGUAGE_CODE,
-                response.content.decode("utf-8"),
-            )
+            rewriter = LinkRewriter(request.LANGUAGE_CODE, response.charset)
+            if response.streaming:
+                if getattr(response, "is_async", False):
+                    response.streaming_content = rewriter.aiter_rewrite(response.streaming_content)
+                else:
+                    response.streaming_content = rewriter.iter_rewrite(response.streaming_content)
+                # the rewritten length is unknown until the body is consumed
+                if "Content-Length" in response:
+                    del response["Content-Length"]
+            else:
+                response.content = rewriter.rewrite(response.content)
+                if "Content-Length" in response:
+                    response["Content-Length"] = str(len(response.content))
         if response.status_code == 301 or response.status_code == 302:
             if "Content-Language" not in response:
                 response["Content-Language"] = translation.get_language()
@@ -187,3 +377,20 @@ class LocaleMiddleware(MiddlewareMixin):
                     "/%s%s" % (request.LANGUAGE_CODE, location[1]),
                 )
         return response
+
+    async def __acall__(self, request):
+        # asgiref is a dependency of Django >= 3.0 only, which is also the
+        # first release calling __acall__
+        from asgiref.sync import sync_to_async
+
+        # the session is the only blocking source, load it in a thread once
+        # and let the sync code above work on the in memory copy
+        if (
+            hasattr(request, "session")
+            and not skip_translation(str(request.path))
+            and has_lang_prefix(request.path_info)
+        ):
+            get_request_language(request).session = await sync_to_async(request.session.get)("django_language")
+        response = self.process_request(request)
+        response = response or await self.get_response(request)
+        return self.process_response(request, response)
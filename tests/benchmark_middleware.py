@@ -0,0 +1,88 @@
+"""
+Compare the throughput of the fluo middlewares called synchronously, with
+their native async path, and adapted by Django as a sync only middleware
+under ASGI (the middleware runs in a thread with sync_to_async)::
+
+    python tests/benchmark_middleware.py [iterations]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from asgiref.sync import async_to_sync, sync_to_async  # noqa: E402
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.contrib.sessions.backends.cache import SessionStore  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from fluo.middleware.debug import UserBasedExceptionMiddleware  # noqa: E402
+from fluo.middleware.locale import LocaleMiddleware  # noqa: E402
+
+BODY = '<html><body><a href="/page/">page</a><form action="/search/"></form></body></html>'
+
+
+def view(request):
+    return HttpResponse(BODY)
+
+
+async def async_view(request):
+    return HttpResponse(BODY)
+
+
+def make_request(factory, session):
+    request = factory.get("/en/page/")
+    request.session = session
+    request.user = AnonymousUser()
+    return request
+
+
+def bench(name, middleware_class, iterations):
+    factory = RequestFactory()
+    session = SessionStore()
+    session["django_language"] = "en"
+    session.save()
+    session = SessionStore(session.session_key)
+
+    middleware = middleware_class(view)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        middleware(make_request(factory, session))
+    sync = time.perf_counter() - start
+
+    async def run_native():
+        middleware = middleware_class(async_view)
+        for _ in range(iterations):
+            await middleware(make_request(factory, session))
+
+    async def run_adapted():
+        # what django.core.handlers.base does with a sync only middleware
+        middleware = sync_to_async(middleware_class(async_to_sync(async_view)), thread_sensitive=True)
+        for _ in range(iterations):
+            await middleware(make_request(factory, session))
+
+    start = time.perf_counter()
+    asyncio.run(run_native())
+    native = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(run_adapted())
+    adapted = time.perf_counter() - start
+
+    print(name)
+    for label, elapsed in [("sync", sync), ("async native", native), ("async adapted", adapted)]:
+        print("  %-14s %8.0f req/s" % (label, iterations / elapsed))
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bench("LocaleMiddleware", LocaleMiddleware, iterations)
+    bench("UserBasedExceptionMiddleware", UserBasedExceptionMiddleware, iterations)
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+import os
+import sys
+
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+
+def runtests(test_labels):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+    TestRunner = get_runner(settings)
+    failures = TestRunner(verbosity=1).run_tests(test_labels or ["tests"])
+    sys.exit(bool(failures))
+
+
+if __name__ == "__main__":
+    runtests(sys.argv[1:])
@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from fluo.db.models.models import default_category_cache
+
+from .testapp.models import Category
+
+
+class CategorySaveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(50):
+            Category.objects.create(name="category %d" % index)
+
+    def test_first_is_default(self):
+        self.assertEqual(Category.objects.get(default=True).name, "category 0")
+
+    def test_set_default_query_count(self):
+        category = Category.objects.get(name="category 25")
+        category.default = True
+        # savepoint, reset of the other defaults, update, release: the same
+        # whatever the number of categories
+        with self.assertNumQueries(4):
+            category.save()
+        self.assertEqual(Category.objects.get(default=True), category)
+
+    def test_create_query_count(self):
+        # two savepoints, is there a default, max ordering, taken slugs,
+        # insert: the same whatever the number of categories
+        with self.assertNumQueries(8):
+            Category.objects.create(name="new")
+        self.assertEqual(Category.objects.filter(default=True).count(), 1)
+
+
+class DefaultCategoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Category.objects.create(name="first")
+        cls.second = Category.objects.create(name="second")
+
+    def setUp(self):
+        # as if setUpTestData had been committed
+        default_category_cache.get_pending().clear()
+        default_category_cache.local.clear()
+        cache.clear()
+
+    def test_cached(self):
+        self.assertEqual(Category.objects.default(), self.first)
+        with self.assertNumQueries(0):
+            self.assertEqual(Category.objects.default(), self.first)
+
+    def test_changed_in_transaction(self):
+        self.assertEqual(Category.objects.default(), self.first)
+        self.second.default = True
+        self.second.save()
+        # TestCase never commits: the change is seen from the database
+        self.assertEqual(Category.objects.default(), self.second)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+    def test_dummy_cache(self):
+        self.assertEqual(Category.objects.default(), self.first)
+        Category.objects.filter(pk=self.first.pk).update(default=False)
+        Category.objects.filter(pk=self.second.pk).update(default=True)
+        self.assertEqual(Category.objects.default(), self.second)
@@ -0,0 +1,48 @@
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+
+from fluo.db import models
+
+from .testapp.models import Category
+
+
+class SlugFieldTests(TestCase):
+    def test_unique_long_slugs(self):
+        name = "a very long category name which fills all the slug field"
+        categories = [Category.objects.create(name="%s %d" % (name, index)) for index in range(12)]
+        slugs = [category.slug for category in categories]
+        self.assertEqual(len(set(slugs)), len(slugs))
+        self.assertTrue(all(len(slug) <= 50 for slug in slugs))
+        self.assertEqual(slugs[0], "a-very-long-category-name-which-fills-all-the-slug")
+        self.assertEqual(slugs[1], "a-very-long-category-name-which-fills-all-the-sl-2")
+        self.assertEqual(slugs[10], "a-very-long-category-name-which-fills-all-the-s-11")
+
+    def test_populate_long_slugs(self):
+        name = "a very long category name which fills all the slug field"
+        Category.objects.create(name=name)
+        Category.objects.create(name=name + "!")
+        objs = Category._meta.get_field("slug").populate([Category(name=name), Category(name=name)])
+        slugs = [obj.slug for obj in objs] + list(Category.objects.values_list("slug", flat=True))
+        self.assertEqual(len(set(slugs)), 4)
+
+    def test_rename_regenerates_slug(self):
+        category = Category.objects.create(name="Windows 10")
+        category = Category.objects.get(pk=category.pk)
+        category.name = "Windows"
+        category.save()
+        self.assertEqual(category.slug, "windows")
+        category = Category.objects.get(pk=category.pk)
+        category.save()
+        self.assertEqual(category.slug, "windows")
+
+
+class NativeTimeDeltaFieldTests(SimpleTestCase):
+    def test_formfield_cleans_to_timedelta(self):
+        field = models.NativeTimeDeltaField(milliseconds=True).formfield()
+        self.assertEqual(field.clean(["1", "02", "03", "400"]), datetime.timedelta(hours=1, minutes=2, seconds=3.4))
+
+    def test_formfield_initial(self):
+        field = models.NativeTimeDeltaField().formfield()
+        value = datetime.timedelta(hours=1, minutes=2, seconds=3)
+        self.assertFalse(field.has_changed(value, field.widget.decompress(value)))
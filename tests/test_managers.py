@@ -0,0 +1,31 @@
+import pickle
+
+from django.test import TestCase
+
+from fluo.db import models
+
+from .testapp.models import Article
+
+
+class CombinedManagerTests(TestCase):
+    def test_querysets_combined(self):
+        queryset = Article.objects.all()
+        self.assertIsInstance(queryset, models.OrderedModelQuerySet)
+        self.assertIsInstance(queryset, models.TimestampQuerySet)
+        self.assertEqual(Article.check(), [])
+
+    def test_methods_of_both_bases(self):
+        articles = Article.objects.bulk_create_ordered([Article(title="first"), Article(title="second")])
+        self.assertEqual([article.ordering for article in articles], [1, 2])
+        # stamped by TimestampQuerySet.bulk_create
+        self.assertTrue(all(article.created_at for article in articles))
+        first, second = Article.objects.order_by("ordering")
+        Article.objects.reorder([second.pk, first.pk])
+        titles = Article.objects.order_by("ordering").values_list("title", flat=True)
+        self.assertEqual(list(titles), ["second", "first"])
+
+    def test_pickle(self):
+        Article.objects.create(title="first")
+        queryset = pickle.loads(pickle.dumps(Article.objects.all()))
+        self.assertIsInstance(queryset, models.TimestampQuerySet)
+        self.assertEqual([article.title for article in queryset], ["first"])
@@ -0,0 +1,60 @@
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from .testapp.admin import LineInline
+from .testapp.models import Line, Option, Order, Value
+
+
+class NestedChangeViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.order = Order.objects.create(name="order")
+        cls.add_lines(5)
+
+    @classmethod
+    def add_lines(cls, count):
+        for index in range(count):
+            line = Line.objects.create(order=cls.order, name="line %d" % index)
+            for option_index in range(3):
+                option = Option.objects.create(line=line, name="option %d" % option_index)
+                for value_index in range(2):
+                    Value.objects.create(option=option, name="value %d" % value_index)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("admin:testapp_order_change", args=[self.order.pk])
+
+    def test_query_count(self):
+        # user, savepoint, order, a query per nesting level, release
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "value 1")
+
+    def test_query_count_independent_of_rows(self):
+        self.add_lines(10)
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+
+class FormsetCacheTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        self.request.user = User(is_superuser=True, is_staff=True, is_active=True)
+
+    def test_shared_formset(self):
+        inline = LineInline(Order, admin.site)
+        self.assertIs(inline.get_formset(self.request, Order(pk=1)), inline.get_formset(self.request, Order(pk=2)))
+
+    def test_per_object_hook(self):
+        class ExtraLineInline(LineInline):
+            def get_extra(self, request, obj=None, **kwargs):
+                return obj.pk
+
+        inline = ExtraLineInline(Order, admin.site)
+        self.assertIsNone(inline.get_formset_cache_key(self.request, Order(pk=1)))
+        self.assertEqual(inline.get_formset(self.request, Order(pk=2)).extra, 2)
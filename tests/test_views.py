@@ -0,0 +1,25 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from fluo.admin.views import CursorSerializer
+
+
+class CursorSerializerTests(SimpleTestCase):
+    def test_round_trip(self):
+        serializer = CursorSerializer()
+        values = [
+            timezone.now(),
+            datetime.datetime(2020, 1, 2, 3, 4, 5),
+            datetime.date(2020, 1, 2),
+            datetime.time(1, 2, 3, 456),
+            datetime.timedelta(seconds=3.5),
+            Decimal("1.10"),
+            uuid.uuid4(),
+            "text",
+            1,
+        ]
+        self.assertEqual(serializer.loads(serializer.dumps(values)), values)
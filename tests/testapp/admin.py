@@ -0,0 +1,25 @@
+from fluo import admin
+
+from .models import Line, Option, Order, Value
+
+
+class ValueInline(admin.TabularInline):
+    model = Value
+    extra = 1
+
+
+class OptionInline(admin.StackedInline):
+    model = Option
+    extra = 1
+    inlines = [ValueInline]
+
+
+class LineInline(admin.StackedInline):
+    model = Line
+    extra = 1
+    inlines = [OptionInline]
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    inlines = [LineInline]
@@ -0,0 +1,28 @@
+from fluo.db import models
+
+
+class Category(models.CategoryModel):
+    pass
+
+
+class Article(models.OrderedModel, models.TimestampModel):
+    title = models.CharField(max_length=100)
+
+
+class Order(models.Model):
+    name = models.CharField(max_length=10)
+
+
+class Line(models.Model):
+    order = models.ForeignKey(Order, related_name="lines", on_delete=models.CASCADE)
+    name = models.CharField(max_length=10)
+
+
+class Option(models.Model):
+    line = models.ForeignKey(Line, related_name="options", on_delete=models.CASCADE)
+    name = models.CharField(max_length=10)
+
+
+class Value(models.Model):
+    option = models.ForeignKey(Option, related_name="values", on_delete=models.CASCADE)
+    name = models.CharField(max_length=10)